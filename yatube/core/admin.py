@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'payload', 'status', 'attempts', 'run_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('last_error',)
+
+
+admin.site.register(Job, JobAdmin)
@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import tasks  # noqa: F401
+        from .db import configure_sqlite
+        connection_created.connect(configure_sqlite)
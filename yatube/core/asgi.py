@@ -0,0 +1,48 @@
+"""Обработчик HTTP для ASGI-сервера поверх channels 2.
+
+AsgiHandler из channels проводит запрос через MIDDLEWARE и
+ROOT_URLCONF, но отправляет ответ из потока синхронного кода: пока
+медленный клиент читает ответ, поток занят. Обычный ответ уже целиком
+в памяти, поэтому его сообщения копятся в потоке и отправляются из
+цикла событий, а поток освобождается сразу после построения страницы.
+Потоковый ответ (выгрузка постов) отправляется по мере чтения
+итератора: держать его целиком в памяти нельзя.
+"""
+from asgiref.sync import async_to_sync, sync_to_async
+from channels import http
+from channels.exceptions import RequestAborted
+
+
+class AsgiHandler(http.AsgiHandler):
+    # Страницы строятся параллельно в пуле потоков, как у WSGI-воркера
+    # с несколькими потоками, а не по очереди в одном
+    handle = sync_to_async(
+        http.AsgiHandler.handle.__wrapped__, thread_sensitive=False
+    )
+
+    async def __call__(self, receive, send):
+        buffered = []
+        streaming = False
+        send_now = async_to_sync(send)
+
+        def send_message(message):
+            nonlocal streaming
+            # more_body - ответ потоковый или не помещается в одно
+            # сообщение: дальше всё уходит клиенту сразу из потока
+            if not streaming and not message.get('more_body'):
+                buffered.append(message)
+                return
+            streaming = True
+            for queued in buffered:
+                send_now(queued)
+            buffered.clear()
+            send_now(message)
+
+        self.send = send_message
+        try:
+            body = await self.read_body(receive)
+        except RequestAborted:
+            return
+        await self.handle(body)
+        for message in buffered:
+            await send(message)
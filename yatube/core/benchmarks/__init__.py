@@ -0,0 +1,4 @@
+"""Бенчмарки проекта: сидирование временной базы и замеры view.
+
+Запуск: python manage.py benchmark --posts 100000 --output result.json
+"""
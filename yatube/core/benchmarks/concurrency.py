@@ -0,0 +1,65 @@
+"""Нагрузка из нескольких процессов, как у gunicorn с воркерами.
+
+Каждый процесс делает запросы тестовым клиентом: чтение лент
+вперемешку с созданием постов. Ошибки блокировки базы считаются
+отдельно от остальных.
+"""
+import multiprocessing
+import random
+import time
+
+from django.db import OperationalError, connections
+
+from .measure import percentile
+from .scenarios import Dataset, make_client, post_create, READS
+
+
+def worker(args):
+    number, requests, write_ratio = args
+    # Соединения родителя нельзя использовать после fork
+    for connection in connections.all():
+        connection.close()
+    data = Dataset(random_seed=number)
+    rnd = random.Random(number)
+    reader = make_client(login=False)
+    writer = make_client(login=True)
+    latencies = []
+    locked = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        try:
+            if rnd.random() < write_ratio:
+                post_create(writer, data)
+            else:
+                rnd.choice(READS)(reader, data)
+        except OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+            locked += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+    for connection in connections.all():
+        connection.close()
+    return latencies, locked
+
+
+def run_workers(workers, requests, write_ratio):
+    """Запускает воркеры и возвращает сводку по всем запросам."""
+    for connection in connections.all():
+        connection.close()
+    context = multiprocessing.get_context('fork')
+    started = time.perf_counter()
+    with context.Pool(workers) as pool:
+        results = pool.map(
+            worker,
+            [(number, requests, write_ratio) for number in range(workers)],
+        )
+    elapsed = time.perf_counter() - started
+    latencies = [value for result, _ in results for value in result]
+    return {
+        'workers': workers,
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'locked': sum(locked for _, locked in results),
+    }
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def benchmark_database(name=None):
+    """Временная тестовая база: бенчмарки не трогают рабочие данные.
+
+    name - путь к файлу базы; без него SQLite создаёт базу в памяти,
+    недоступную другим процессам.
+    """
+    test_settings = connection.settings_dict['TEST']
+    old_test_name = test_settings['NAME']
+    if name is not None:
+        test_settings['NAME'] = name
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = old_test_name
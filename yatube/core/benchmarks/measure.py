@@ -0,0 +1,44 @@
+import math
+import statistics
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def measure(call, requests, memory_samples=10):
+    """Задержка, число запросов к базе и пик памяти для call().
+
+    Память замеряется отдельным проходом: tracemalloc
+    заметно замедляет выполнение и исказил бы задержку.
+    """
+    latencies = []
+    queries = []
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            call()
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+    peaks = []
+    for _ in range(memory_samples):
+        tracemalloc.start()
+        call()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        'requests': requests,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(statistics.mean(latencies), 3),
+        'queries_per_request': round(statistics.mean(queries), 2),
+        'max_queries': max(queries),
+        'peak_memory_kb': round(max(peaks) / 1024, 1) if peaks else None,
+    }
@@ -0,0 +1,101 @@
+"""Сценарии нагрузки: каждый делает один запрос тестовым клиентом.
+
+Страницы, группы, авторы и посты выбираются случайно, но с
+фиксированным seed, поэтому прогоны на разных коммитах сравнимы.
+"""
+import random
+
+from django.test import Client
+from django.urls import reverse
+from posts.models import Group, Post, User
+
+from .seed import BENCH_PASSWORD, username
+
+# Случайные страницы берутся из первых, самых посещаемых
+MAX_PAGE = 50
+
+
+class Dataset:
+    """Выборка объектов из засеянной базы, по которой ходят сценарии."""
+    def __init__(self, sample=200, random_seed=0):
+        self.random = random.Random(random_seed)
+        self.slugs = list(
+            Group.objects.order_by('?').values_list('slug', flat=True)[:sample]
+        )
+        self.group_ids = list(
+            Group.objects.filter(slug__in=self.slugs)
+            .values_list('pk', flat=True)
+        )
+        self.usernames = list(
+            User.objects.filter(posts__isnull=False).distinct()
+            .order_by('?').values_list('username', flat=True)[:sample]
+        )
+        self.post_ids = list(
+            Post.objects.order_by('?').values_list('pk', flat=True)[:sample]
+        )
+
+    def page(self):
+        return {'page': self.random.randint(1, MAX_PAGE)}
+
+
+def index(client, data):
+    return client.get(reverse('posts:main_page'), data.page())
+
+
+def group_posts(client, data):
+    slug = data.random.choice(data.slugs)
+    return client.get(reverse('posts:group_list', args=(slug,)), data.page())
+
+
+def profile(client, data):
+    name = data.random.choice(data.usernames)
+    return client.get(reverse('posts:profile', args=(name,)), data.page())
+
+
+def post_detail(client, data):
+    post_id = data.random.choice(data.post_ids)
+    return client.get(reverse('posts:post_detail', args=(post_id,)))
+
+
+def post_create(client, data):
+    return client.post(reverse('posts:post_create'), {
+        'text': 'Пост из бенчмарка',
+        'group': data.random.choice(data.group_ids),
+    })
+
+
+# Сценарии чтения для смешанной нагрузки
+READS = (index, group_posts, profile, post_detail)
+
+# Имя сценария -> (функция, нужен ли вход)
+SCENARIOS = {
+    'index': (index, False),
+    'group_posts': (group_posts, False),
+    'profile': (profile, False),
+    'post_detail': (post_detail, False),
+    'post_create': (post_create, True),
+}
+
+
+def make_client(login):
+    client = Client()
+    if login:
+        client.login(username=username(0), password=BENCH_PASSWORD)
+    return client
+
+
+def make_call(name, data):
+    """Возвращает функцию без аргументов, которая падает на ошибке."""
+    func, login = SCENARIOS[name]
+    client = make_client(login)
+
+    def call():
+        response = func(client, data)
+        # Несуществующая страница ленты отдаёт последнюю, 404 не ждём
+        if response.status_code >= 400:
+            raise AssertionError(
+                f'{name}: ответ {response.status_code}'
+            )
+        return response
+
+    return call
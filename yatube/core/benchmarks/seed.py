@@ -0,0 +1,72 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from faker import Faker
+from posts.importing import PostImporter
+from posts.models import Group, User
+
+BENCH_PASSWORD = 'bench-password'
+# Посты публикуются в течение последних трёх лет
+PUB_DATE_SPAN = 3 * 365 * 24 * 60 * 60
+# Тексты берутся из пула: генерация Faker дороже самой вставки
+TEXT_POOL_SIZE = 1000
+
+
+def username(number):
+    return f'bench_{number}'
+
+
+def slug(number):
+    return f'bench-{number}'
+
+
+def seed(posts, authors, groups, random_seed=0, batch_size=10000,
+         progress=None):
+    """Создаёт авторов, группы и посты; 80% постов - в группах."""
+    fake = Faker('ru_RU')
+    fake.seed_instance(random_seed)
+    rnd = random.Random(random_seed)
+    # Один хеш на всех: make_password на каждого занял бы минуты
+    password = make_password(BENCH_PASSWORD)
+    User.objects.bulk_create(
+        (
+            User(
+                username=username(number),
+                first_name=fake.first_name(),
+                last_name=fake.last_name(),
+                password=password,
+            )
+            for number in range(authors)
+        ),
+        batch_size=batch_size,
+    )
+    Group.objects.bulk_create(
+        (
+            Group(
+                title=fake.sentence(nb_words=3)[:200],
+                slug=slug(number),
+                description=fake.paragraph(),
+            )
+            for number in range(groups)
+        ),
+        batch_size=batch_size,
+    )
+    texts = [
+        fake.paragraph(nb_sentences=5)
+        for _ in range(min(posts, TEXT_POOL_SIZE))
+    ]
+    now = timezone.now()
+    rows = (
+        {
+            'text': rnd.choice(texts),
+            'author': username(rnd.randrange(authors)),
+            'group': slug(rnd.randrange(groups)) if rnd.random() < 0.8
+            else None,
+            'pub_date': now - timedelta(seconds=rnd.randrange(PUB_DATE_SPAN)),
+        }
+        for _ in range(posts)
+    )
+    # Импорт заодно создаёт профили и пересчитывает счётчики
+    PostImporter(batch_size).run(rows, progress)
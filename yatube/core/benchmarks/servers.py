@@ -0,0 +1,101 @@
+"""WSGI против ASGI при медленных клиентах, в одном процессе.
+
+Медленный клиент долго отправляет запрос и читает ответ (delay до и
+после обработки). WSGI-воркер держит на это время поток, как gthread
+у gunicorn; под ASGI ожидание - корутина в цикле событий.
+"""
+import asyncio
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.core.handlers.wsgi import WSGIHandler
+
+
+def wsgi_environ(path):
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET'}
+    setup_testing_defaults(environ)
+    return environ
+
+
+def run_wsgi(paths, delay, threads):
+    handler = WSGIHandler()
+
+    def connection(path):
+        time.sleep(delay)
+        statuses = []
+        body = handler(
+            wsgi_environ(path),
+            lambda status, headers: statuses.append(status),
+        )
+        b''.join(body)
+        time.sleep(delay)
+        return int(statuses[0].split()[0])
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(connection, paths))
+
+
+def asgi_scope(path):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+
+
+async def asgi_connection(application, path, delay):
+    status = None
+
+    async def receive():
+        await asyncio.sleep(delay)
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif not message.get('more_body'):
+            await asyncio.sleep(delay)
+
+    # channels 2 - приложения ASGI 2: scope, затем receive и send
+    await application(asgi_scope(path))(receive, send)
+    return status
+
+
+def run_asgi(application, paths, delay):
+    async def main():
+        return await asyncio.gather(*(
+            asgi_connection(application, path, delay) for path in paths
+        ))
+
+    return asyncio.run(main())
+
+
+def measure_server(run, connections):
+    """Запросов в секунду и пик памяти Python на одно соединение.
+
+    Память замеряется вторым прогоном: tracemalloc замедляет
+    обработку в разы.
+    """
+    started = time.perf_counter()
+    statuses = run()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'connections': connections,
+        'rps': round(connections / elapsed, 1),
+        'errors': sum(status != 200 for status in statuses),
+        'memory_per_connection_kb': round(peak / connections / 1024, 1),
+    }
@@ -0,0 +1,35 @@
+"""Время рендеринга шаблона с кеширующим загрузчиком и без него."""
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def template_backend(cached):
+    """Движок шаблонов проекта с заданным набором загрузчиков."""
+    config = settings.TEMPLATES[0]
+    options = {
+        key: value for key, value in config['OPTIONS'].items()
+        if key != 'loaders'
+    }
+    options['loaders'] = (
+        [('django.template.loaders.cached.Loader', LOADERS)] if cached
+        else LOADERS
+    )
+    return DjangoTemplates({
+        'NAME': 'cached' if cached else 'uncached',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': options,
+    })
+
+
+def render_call(backend, name, context, request):
+    """Как при обычном запросе: загрузка шаблона и рендеринг."""
+    def call():
+        return backend.get_template(name).render(context, request)
+
+    return call
@@ -0,0 +1,65 @@
+"""Байты, которые браузер скачивает за загрузку страницы.
+
+Страница запрашивается тестовым клиентом, статика из её HTML - через
+core.views.serve_static из STATIC_ROOT, собранного collectstatic.
+"""
+import gzip
+import re
+
+from django.conf import settings
+from django.test import Client, RequestFactory
+
+from core import compression
+from core.views import serve_static
+
+
+def decompress(data, encoding):
+    if encoding == 'gzip':
+        return gzip.decompress(data)
+    if encoding == 'br':
+        return compression.brotli.decompress(data)
+    return data
+
+
+def page_assets(html):
+    """Адреса статики, на которые ссылается страница."""
+    pattern = r'(?:href|src)="({}[^"]+)"'.format(
+        re.escape(settings.STATIC_URL)
+    )
+    return sorted(set(re.findall(pattern, html)))
+
+
+def fetch_asset(url, accept_encoding):
+    request = RequestFactory().get(
+        url, HTTP_ACCEPT_ENCODING=accept_encoding
+    )
+    response = serve_static(request, url[len(settings.STATIC_URL):])
+    size = len(b''.join(response.streaming_content))
+    return size, settings.STATIC_CACHE_CONTROL in response.get(
+        'Cache-Control', ''
+    )
+
+
+def page_load(scenario, data, accept_encoding):
+    """Байты HTML и статики при первом визите и запросы при повторном.
+
+    При повторном визите браузер заново запрашивает страницу и ту
+    статику, у которой нет долгого Cache-Control.
+    """
+    client = Client(HTTP_ACCEPT_ENCODING=accept_encoding)
+    response = scenario(client, data)
+    encoding = response.get('Content-Encoding')
+    html = decompress(response.content, encoding).decode()
+    result = {
+        'html_bytes': len(response.content),
+        'static_bytes': 0,
+        'static_requests': 0,
+        'revalidated': 0,
+    }
+    for url in page_assets(html):
+        size, immutable = fetch_asset(url, accept_encoding)
+        result['static_bytes'] += size
+        result['static_requests'] += 1
+        result['revalidated'] += not immutable
+    result['total_bytes'] = result['html_bytes'] + result['static_bytes']
+    return result
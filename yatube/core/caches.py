@@ -0,0 +1,10 @@
+"""Свойства настроенного кеша."""
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_process_local(alias='default'):
+    """Кеш живёт в памяти процесса: воркеры не видят записей
+    и удалений друг друга.
+    """
+    return isinstance(caches[alias], LocMemCache)
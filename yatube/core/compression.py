@@ -0,0 +1,91 @@
+"""Сжатие ответов и статики: brotli, если установлен пакет brotli, и gzip.
+
+Для ответов на лету уровень сжатия умеренный, статика сжимается один
+раз при collectstatic с максимальным уровнем.
+"""
+import gzip
+
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Короче этого сжатие не окупает заголовки gzip
+MIN_LENGTH = 200
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+)
+# Расширения сжатых копий статики
+EXTENSIONS = {'br': '.br', 'gzip': '.gz'}
+BROTLI_QUALITY = 5
+
+
+def available_encodings():
+    """Поддерживаемые кодировки, предпочтительная первой."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compressible(content_type):
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding с их весами q."""
+    encodings = {}
+    for part in (header or '').split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        encodings[name] = weight
+    return encodings
+
+
+def accepts(accepted, encoding):
+    return accepted.get(encoding, accepted.get('*', 0)) > 0
+
+
+def choose_encoding(header):
+    """Лучшая кодировка, которую принимает клиент, или None."""
+    accepted = accepted_encodings(header)
+    for encoding in available_encodings():
+        if accepts(accepted, encoding):
+            return encoding
+    return None
+
+
+def compress(data, encoding, best=False):
+    """Сжимает байты; best - максимальный уровень для статики."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if best else BROTLI_QUALITY)
+    if best:
+        # mtime=0: одинаковые файлы дают одинаковый архив
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return compress_string(data)
+
+
+def compress_chunks(chunks, encoding):
+    """Сжимает потоковый ответ по частям."""
+    if encoding == 'gzip':
+        yield from compress_sequence(chunks)
+        return
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
@@ -0,0 +1,80 @@
+"""Настройка соединений SQLite и маршрутизация чтения.
+
+Каждое новое соединение SQLite получает PRAGMA из SQLITE_PRAGMAS:
+WAL позволяет читателям работать параллельно с писателем. Соединения
+с READ_ONLY в настройках базы дополнительно получают query_only.
+
+View, помеченные read_replica, читают через DATABASE_READ_ALIAS,
+если такой alias описан в DATABASES; ReadReplicaMiddleware держит
+признак до конца рендеринга ответа.
+"""
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+_state = threading.local()
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Обработчик connection_created."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = dict(settings.SQLITE_PRAGMAS)
+    if connection.settings_dict.get('READ_ONLY'):
+        # Смена режима журнала - запись, на чтении она не нужна
+        pragmas.pop('journal_mode', None)
+        pragmas['query_only'] = 'ON'
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def read_replica(view):
+    """Помечает view: её GET-запросы читают с DATABASE_READ_ALIAS."""
+    view.read_replica = True
+    return view
+
+
+def read_alias():
+    alias = settings.DATABASE_READ_ALIAS
+    if getattr(_state, 'reading', False) and alias in connections.databases:
+        return alias
+    return None
+
+
+class ReadReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            _state.reading = False
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in ('GET', 'HEAD') and getattr(
+            view_func, 'read_replica', False
+        ):
+            _state.reading = True
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика - та же база, объекты из неё можно связывать
+        aliases = {'default', settings.DATABASE_READ_ALIAS}
+        if {obj1._state.db, obj2._state.db} <= aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if connections.databases[db].get('READ_ONLY'):
+            return False
+        return None
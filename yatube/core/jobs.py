@@ -0,0 +1,147 @@
+"""Очередь фоновых задач в базе данных.
+
+Задача регистрируется декоратором task и ставится в очередь через
+enqueue в той же транзакции, что и изменение данных: если транзакция
+откатится, задачи не будет. Одинаковые задачи (имя и аргументы), ещё
+не взятые воркером, хранятся одной строкой. При JOBS_EAGER задачи
+выполняются в процессе сразу после фиксации транзакции - так работают
+тесты и разработка без воркеров.
+"""
+import hashlib
+import json
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, models, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(name):
+    """Регистрирует функцию как задачу с именем name."""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(name, **kwargs):
+    if name not in TASKS:
+        raise KeyError(f'Задача {name} не зарегистрирована')
+    if settings.JOBS_EAGER:
+        transaction.on_commit(lambda: TASKS[name](**kwargs))
+        return
+    payload = json.dumps(kwargs, sort_keys=True)
+    dedupe_key = hashlib.sha1(f'{name}:{payload}'.encode()).hexdigest()
+    # INSERT OR IGNORE: уже ждущая такая же задача остаётся одна
+    Job.objects.bulk_create(
+        [Job(name=name, payload=payload, dedupe_key=dedupe_key)],
+        ignore_conflicts=True,
+    )
+
+
+def claim(worker, limit):
+    """Забирает до limit готовых задач одним UPDATE.
+
+    Задачи, зависшие в running дольше JOBS_LOCK_TIMEOUT (воркер упал),
+    забираются заново.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    ready = Job.objects.filter(
+        models.Q(status=Job.PENDING, run_at__lte=now)
+        | models.Q(status=Job.RUNNING, locked_at__lt=stale)
+    ).order_by('run_at').values('pk')[:limit]
+    claimed = Job.objects.filter(pk__in=models.Subquery(ready)).update(
+        status=Job.RUNNING, locked_by=worker, locked_at=now
+    )
+    if not claimed:
+        return []
+    return list(Job.objects.filter(status=Job.RUNNING, locked_by=worker))
+
+
+def run_job(job):
+    try:
+        with transaction.atomic():
+            TASKS[job.name](**json.loads(job.payload))
+    except Exception:
+        retry(job, traceback.format_exc())
+    else:
+        job.delete()
+
+
+def retry(job, error):
+    job.attempts += 1
+    job.last_error = error
+    job.locked_by = ''
+    job.locked_at = None
+    if job.attempts >= settings.JOBS_MAX_ATTEMPTS:
+        logger.error('Задача %s не выполнена: %s', job, error)
+        job.status = Job.FAILED
+        job.save()
+        return
+    job.status = Job.PENDING
+    # Экспоненциальная пауза перед повтором: 2, 4, 8... секунд
+    job.run_at = timezone.now() + timedelta(seconds=2 ** job.attempts)
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        # В очереди уже ждёт такая же задача, она и выполнит работу
+        job.delete()
+
+
+def new_worker_id():
+    return uuid.uuid4().hex
+
+
+def run_pending(worker=None, batch_size=50):
+    """Выполняет задачи, пока они есть; возвращает их число."""
+    worker = worker or new_worker_id()
+    done = 0
+    while True:
+        jobs = claim(worker, batch_size)
+        if not jobs:
+            return done
+        for job in jobs:
+            run_job(job)
+        done += len(jobs)
+
+
+def work(stop, poll=1.0, batch_size=50):
+    """Цикл воркера: выполняет задачи, пока не выставлен stop."""
+    worker = new_worker_id()
+    try:
+        while not stop.is_set():
+            if not run_pending(worker, batch_size):
+                stop.wait(poll)
+    finally:
+        connections.close_all()
+
+
+def queue_stats():
+    counts = dict(
+        Job.objects.order_by().values_list('status')
+        .annotate(total=models.Count('pk'))
+    )
+    oldest = (
+        Job.objects.filter(status=Job.PENDING)
+        .aggregate(oldest=models.Min('created_at'))['oldest']
+    )
+    return {
+        'pending': counts.get(Job.PENDING, 0),
+        'running': counts.get(Job.RUNNING, 0),
+        'failed': counts.get(Job.FAILED, 0),
+        'oldest_pending_seconds': (
+            (timezone.now() - oldest).total_seconds() if oldest else 0
+        ),
+    }
@@ -0,0 +1,123 @@
+import json
+import platform
+import subprocess
+from datetime import datetime
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core.benchmarks.database import benchmark_database
+from core.benchmarks.measure import measure
+from core.benchmarks.scenarios import SCENARIOS, Dataset, make_call
+from core.benchmarks.seed import seed
+
+# Метрики, которые сравниваются между прогонами
+COMPARED = ('p50_ms', 'p99_ms', 'queries_per_request', 'peak_memory_kb')
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ('Засевает временную базу и замеряет задержку, число запросов '
+            'и память основных страниц; результат сохраняется в JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--authors', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--scenarios', default=','.join(SCENARIOS),
+            help='Сценарии через запятую'
+        )
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Отключить кеш фрагментов лент'
+        )
+        parser.add_argument('--output', help='Куда сохранить JSON')
+        parser.add_argument(
+            '--compare', help='JSON прошлого прогона для сравнения'
+        )
+
+    def handle(self, *args, **options):
+        names = options['scenarios'].split(',')
+        unknown = set(names) - SCENARIOS.keys()
+        if unknown:
+            raise CommandError(f'Нет сценариев: {", ".join(sorted(unknown))}')
+        if min(options['posts'], options['authors'], options['groups']) < 1:
+            raise CommandError('Нужен хотя бы один пост, автор и группа')
+        previous = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                previous = json.load(file)
+        overrides = {'FEED_CACHE_TIMEOUT': 0} if options['no_cache'] else {}
+        with benchmark_database(), override_settings(**overrides):
+            self.seed(options)
+            results = self.run(names, options)
+        report = {
+            'commit': git_commit(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'volumes': {
+                name: options[name] for name in ('posts', 'authors', 'groups')
+            },
+            'cache': not options['no_cache'],
+            'scenarios': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+            self.stdout.write(f'Результат записан в {options["output"]}')
+        if previous is not None:
+            self.compare(previous, report)
+
+    def seed(self, options):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Сидирование: {options["posts"]} постов, '
+            f'{options["authors"]} авторов, {options["groups"]} групп'
+        ))
+        seed(
+            options['posts'], options['authors'], options['groups'],
+            random_seed=options['seed'],
+            progress=lambda done: self.stdout.write(f'  {done} постов'),
+        )
+
+    def run(self, names, options):
+        data = Dataset(random_seed=options['seed'])
+        results = {}
+        for name in names:
+            call = make_call(name, data)
+            for _ in range(options['warmup']):
+                call()
+            results[name] = measure(call, options['requests'])
+            self.stdout.write(f'{name}: {results[name]}')
+        return results
+
+    def compare(self, previous, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Сравнение с {previous.get("commit") or "прошлым прогоном"}'
+        ))
+        for name, current in report['scenarios'].items():
+            old = previous.get('scenarios', {}).get(name)
+            if old is None:
+                continue
+            parts = []
+            for metric in COMPARED:
+                before, after = old.get(metric), current.get(metric)
+                if not before or after is None:
+                    continue
+                change = (after - before) / before * 100
+                parts.append(f'{metric} {before} -> {after} ({change:+.1f}%)')
+            self.stdout.write(f'{name}: {"; ".join(parts)}')
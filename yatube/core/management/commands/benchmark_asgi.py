@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from core.benchmarks.database import benchmark_database
+from core.benchmarks.scenarios import Dataset
+from core.benchmarks.seed import seed
+from core.benchmarks.servers import measure_server, run_asgi, run_wsgi
+from yatube.routing import application
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает WSGI и ASGI на страницах лент при множестве '
+            'медленных клиентов: запросы в секунду и память на соединение')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=200)
+        parser.add_argument(
+            '--delay', type=float, default=0.2,
+            help='Секунды на отправку запроса и на чтение ответа'
+        )
+        parser.add_argument(
+            '--threads', type=int, default=8, help='Потоков WSGI-воркера'
+        )
+        parser.add_argument('--posts', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            seed(options['posts'], authors=200, groups=20)
+            paths = self.paths(Dataset(), options['connections'])
+            results = {
+                'WSGI': measure_server(
+                    lambda: run_wsgi(
+                        paths, options['delay'], options['threads']
+                    ),
+                    len(paths),
+                ),
+                'ASGI': measure_server(
+                    lambda: run_asgi(application, paths, options['delay']),
+                    len(paths),
+                ),
+            }
+        for name, result in results.items():
+            self.stdout.write(f'{name}: {result}')
+
+    def paths(self, data, count):
+        urls = [
+            lambda: reverse('posts:main_page'),
+            lambda: reverse(
+                'posts:group_list', args=(data.random.choice(data.slugs),)
+            ),
+            lambda: reverse(
+                'posts:profile', args=(data.random.choice(data.usernames),)
+            ),
+            lambda: reverse(
+                'posts:post_detail', args=(data.random.choice(data.post_ids),)
+            ),
+        ]
+        return [urls[number % len(urls)]() for number in range(count)]
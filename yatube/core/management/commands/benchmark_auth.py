@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core.benchmarks.database import benchmark_database
+from core.benchmarks.measure import measure
+from core.benchmarks.scenarios import READS, Dataset, make_client
+from core.benchmarks.seed import seed
+
+# Настройки Django по умолчанию: сессия и пользователь из базы
+BASELINE = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+}
+CACHED = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+    'AUTHENTICATION_BACKENDS': ['users.backends.CachedModelBackend'],
+}
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает число запросов к базе на страницу для вошедшего '
+            'пользователя без кеша сессий и пользователя и с ним')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--requests', type=int, default=100)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            seed(posts=options['posts'], authors=50, groups=10)
+            results = {}
+            for label, config in (('без кеша', BASELINE),
+                                  ('с кешем', CACHED)):
+                cache.clear()
+                with override_settings(**config):
+                    results[label] = self.run(options['requests'])
+        for scenario in READS:
+            name = scenario.__name__
+            before = results['без кеша'][name]
+            after = results['с кешем'][name]
+            self.stdout.write(
+                f'{name}: {before["queries_per_request"]} -> '
+                f'{after["queries_per_request"]} запросов, '
+                f'p50 {before["p50_ms"]} -> {after["p50_ms"]} мс'
+            )
+
+    def run(self, requests):
+        # Вход заново: сессия создаётся выбранным движком
+        client = make_client(login=True)
+        data = Dataset()
+        results = {}
+        for scenario in READS:
+            def call():
+                return scenario(client, data)
+
+            call()
+            results[scenario.__name__] = measure(
+                call, requests, memory_samples=0
+            )
+        return results
@@ -0,0 +1,69 @@
+import base64
+import json
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.benchmarks.database import benchmark_database
+from core.benchmarks.scenarios import Dataset, make_client
+from core.benchmarks.seed import BENCH_PASSWORD, seed, username
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает создание N постов последовательными POST формы '
+            'и одним запросом к пакетному API')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--batch', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            seed(posts=options['posts'], authors=50, groups=10)
+            data = Dataset()
+            items = [
+                {
+                    'text': f'Пост из бенчмарка {number}',
+                    'group': data.random.choice(data.group_ids),
+                }
+                for number in range(options['batch'])
+            ]
+            results = {}
+            for label, run in (('форма', self.sequential),
+                               ('API', self.bulk)):
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    run(items)
+                    elapsed = time.perf_counter() - start
+                results[label] = (elapsed, len(queries))
+        for label, (elapsed, queries) in results.items():
+            self.stdout.write(
+                f'{label}: {len(items)} постов за {elapsed * 1000:.0f} мс, '
+                f'{len(items) / elapsed:.0f} постов/с, '
+                f'{queries} запросов к базе'
+            )
+
+    def sequential(self, items):
+        client = make_client(login=True)
+        for item in items:
+            response = client.post(reverse('posts:post_create'), item)
+            if response.status_code != 302:
+                raise AssertionError(f'форма: ответ {response.status_code}')
+
+    def bulk(self, items):
+        credentials = base64.b64encode(
+            f'{username(0)}:{BENCH_PASSWORD}'.encode()
+        ).decode()
+        response = Client().post(
+            reverse('posts:post_bulk_create'), json.dumps(items),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Basic {credentials}',
+        )
+        if response.status_code != 201:
+            raise AssertionError(f'API: ответ {response.status_code}')
@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import override_settings
+
+from core.benchmarks.concurrency import run_workers
+from core.benchmarks.database import benchmark_database
+from core.benchmarks.seed import seed
+
+# Настройки SQLite по умолчанию: журнал отката и полная синхронизация
+BASELINE_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+READ_ALIAS = 'replica'
+
+
+class Command(BaseCommand):
+    help = ('Нагружает файловую базу SQLite из нескольких процессов: '
+            'настройки по умолчанию против WAL и соединений для чтения')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument(
+            '--requests', type=int, default=200, help='Запросов на воркер'
+        )
+        parser.add_argument('--write-ratio', type=float, default=0.1)
+        parser.add_argument('--posts', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'benchmark.sqlite3')
+            with benchmark_database(path):
+                seed(options['posts'], authors=500, groups=50)
+                connections.databases[READ_ALIAS] = {
+                    **connection.settings_dict, 'READ_ONLY': True,
+                }
+                try:
+                    self.compare(options)
+                finally:
+                    connections[READ_ALIAS].close()
+                    del connections.databases[READ_ALIAS]
+                    del connections[READ_ALIAS]
+
+    def compare(self, options):
+        modes = {
+            'по умолчанию': {
+                'SQLITE_PRAGMAS': BASELINE_PRAGMAS,
+                'DATABASE_READ_ALIAS': None,
+            },
+            'WAL и чтение через replica': {
+                'DATABASE_READ_ALIAS': READ_ALIAS,
+            },
+        }
+        for label, overrides in modes.items():
+            with override_settings(**overrides):
+                # Новые PRAGMA применяются к новым соединениям
+                connection.close()
+                connection.ensure_connection()
+                result = run_workers(
+                    options['workers'], options['requests'],
+                    options['write_ratio'],
+                )
+            self.stdout.write(f'{label}: {result}')
@@ -0,0 +1,43 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from core.benchmarks.database import benchmark_database
+from core.benchmarks.measure import measure
+from core.benchmarks.seed import seed
+from core.benchmarks.templates import render_call, template_backend
+from posts.models import Post
+from posts.paginator import get_paginator
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время рендеринга шаблона без кеширующего '
+            'загрузчика и с ним')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--template', default='posts/index.html')
+        parser.add_argument('--requests', type=int, default=500)
+
+    def handle(self, *args, **options):
+        # Без кеша фрагментов: иначе лента не рендерится вовсе
+        with benchmark_database(), override_settings(FEED_CACHE_TIMEOUT=0):
+            seed(posts=100, authors=10, groups=5)
+            request = RequestFactory().get('/')
+            request.user = AnonymousUser()
+            page_obj = get_paginator(Post.objects.for_feed(), request)
+            # Посты загружаются один раз: замеряется только шаблон
+            page_obj.object_list = list(page_obj.object_list)
+            context = {'page_obj': page_obj, 'feed_scope': 'all'}
+            for cached in (False, True):
+                call = render_call(
+                    template_backend(cached), options['template'],
+                    context, request,
+                )
+                call()
+                result = measure(call, options['requests'])
+                label = 'с кешем' if cached else 'без кеша'
+                self.stdout.write(
+                    f'{options["template"]} {label}: '
+                    f'p50 {result["p50_ms"]} мс, p99 {result["p99_ms"]} мс'
+                )
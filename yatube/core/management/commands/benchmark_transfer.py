@@ -0,0 +1,54 @@
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core import compression
+from core.benchmarks.database import benchmark_database
+from core.benchmarks.scenarios import READS, Dataset
+from core.benchmarks.seed import seed
+from core.benchmarks.transfer import page_load
+
+PLAIN_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+COMPRESSED_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+
+class Command(BaseCommand):
+    help = ('Считает байты HTML и статики за загрузку страниц без сжатия '
+            'и со сжатием и хешированной статикой')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=200)
+
+    def handle(self, *args, **options):
+        variants = [('без сжатия', PLAIN_STORAGE, '')]
+        variants += [
+            (encoding, COMPRESSED_STORAGE, encoding)
+            for encoding in reversed(compression.available_encodings())
+        ]
+        with benchmark_database():
+            seed(posts=options['posts'], authors=10, groups=5)
+            for label, storage, accept_encoding in variants:
+                self.stdout.write(self.style.MIGRATE_HEADING(label))
+                with tempfile.TemporaryDirectory() as static_root:
+                    # При DEBUG хешированные имена не подставляются
+                    with override_settings(STATIC_ROOT=static_root,
+                                           STATICFILES_STORAGE=storage,
+                                           DEBUG=False):
+                        call_command(
+                            'collectstatic', interactive=False, verbosity=0
+                        )
+                        self.run(accept_encoding)
+
+    def run(self, accept_encoding):
+        data = Dataset()
+        for scenario in READS:
+            result = page_load(scenario, data, accept_encoding)
+            self.stdout.write(
+                f'{scenario.__name__}: {result["total_bytes"]} Б '
+                f'(HTML {result["html_bytes"]}, статика '
+                f'{result["static_bytes"]} в {result["static_requests"]} '
+                f'файлах); повторный визит перезапрашивает '
+                f'{result["revalidated"]} файлов статики'
+            )
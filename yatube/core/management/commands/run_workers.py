@@ -0,0 +1,71 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import run_pending, work
+
+
+class Command(BaseCommand):
+    help = 'Запускает воркеры фоновых задач в потоках или процессах'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument(
+            '--mode', choices=('thread', 'process'), default='thread'
+        )
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument(
+            '--poll', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить накопившиеся задачи и выйти'
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            done = run_pending(batch_size=options['batch_size'])
+            self.stdout.write(f'Выполнено задач: {done}')
+            return
+        if options['mode'] == 'process':
+            # Соединения родителя нельзя использовать после fork
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            stop = context.Event()
+            workers = [
+                context.Process(
+                    target=work,
+                    args=(stop, options['poll'], options['batch_size']),
+                )
+                for _ in range(options['workers'])
+            ]
+        else:
+            stop = threading.Event()
+            workers = [
+                threading.Thread(
+                    target=work,
+                    args=(stop, options['poll'], options['batch_size']),
+                )
+                for _ in range(options['workers'])
+            ]
+
+        def shutdown(signum, frame):
+            # Воркеры доделывают текущие задачи и выходят
+            stop.set()
+
+        # До fork: процессы-воркеры наследуют обработчики
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, shutdown)
+        for worker in workers:
+            worker.start()
+        self.stdout.write(
+            f'Запущено воркеров: {len(workers)} ({options["mode"]}), '
+            'Ctrl+C - остановка'
+        )
+        for worker in workers:
+            worker.join()
+        self.stdout.write('Воркеры остановлены')
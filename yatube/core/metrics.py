@@ -0,0 +1,136 @@
+"""Метрики запросов, собранные RequestMetricsMiddleware.
+
+Агрегаты по имени URL лежат в кеше счётчиками, поэтому их видят все
+процессы с общим кешем. Время хранится в микросекундах: incr работает
+только с целыми числами.
+"""
+import time
+
+from django.core.cache import cache
+
+KEY = 'core:metrics:{}:{}'
+NAMES_KEY = 'core:metrics:names'
+# Верхние границы корзин гистограмм, последняя - всё остальное
+TIME_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50)
+TOTALS = ('count', 'queries', 'sql_us', 'render_us', 'total_us')
+
+
+class RequestMetrics:
+    """Стоимость одного запроса."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql = 0.0
+        self.render = 0.0
+        self.total = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        """Обёртка для connection.execute_wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql += time.perf_counter() - started
+            self.queries += 1
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def server_timing(self):
+        return ', '.join((
+            f'sql;desc="{self.queries} queries";dur={self.sql * 1000:.2f}',
+            f'render;dur={self.render * 1000:.2f}',
+            f'total;dur={self.total * 1000:.2f}',
+        ))
+
+
+def bucket(value, bounds):
+    for number, bound in enumerate(bounds):
+        if value <= bound:
+            return number
+    return len(bounds)
+
+
+def _incr(key, delta):
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        pass
+
+
+def record(name, metrics):
+    if cache.add(KEY.format(name, 'count'), 0, None):
+        names = cache.get(NAMES_KEY, set())
+        cache.set(NAMES_KEY, names | {name}, None)
+    values = {
+        'count': 1,
+        'queries': metrics.queries,
+        'sql_us': int(metrics.sql * 1000000),
+        'render_us': int(metrics.render * 1000000),
+        'total_us': int(metrics.total * 1000000),
+        f'time_{bucket(metrics.total * 1000, TIME_BUCKETS_MS)}': 1,
+        f'queries_{bucket(metrics.queries, QUERY_BUCKETS)}': 1,
+    }
+    for field, delta in values.items():
+        _incr(KEY.format(name, field), delta)
+
+
+def histogram(counters, name, prefix, bounds):
+    labels = [f'≤ {bound}' for bound in bounds] + [f'> {bounds[-1]}']
+    return [
+        (label, counters.get(KEY.format(name, f'{prefix}_{number}'), 0))
+        for number, label in enumerate(labels)
+    ]
+
+
+def summary():
+    """Средние и гистограммы по каждому имени URL."""
+    names = sorted(cache.get(NAMES_KEY, set()))
+    fields = list(TOTALS)
+    fields += [f'time_{n}' for n in range(len(TIME_BUCKETS_MS) + 1)]
+    fields += [f'queries_{n}' for n in range(len(QUERY_BUCKETS) + 1)]
+    counters = cache.get_many(
+        [KEY.format(name, field) for name in names for field in fields]
+    )
+    rows = []
+    for name in names:
+        count = counters.get(KEY.format(name, 'count'), 0)
+        if not count:
+            continue
+
+        def average(field, scale=1):
+            return counters.get(KEY.format(name, field), 0) / count / scale
+
+        rows.append({
+            'name': name,
+            'count': count,
+            'queries': average('queries'),
+            'sql_ms': average('sql_us', 1000),
+            'render_ms': average('render_us', 1000),
+            'total_ms': average('total_us', 1000),
+            'time_histogram': histogram(
+                counters, name, 'time', TIME_BUCKETS_MS
+            ),
+            'query_histogram': histogram(
+                counters, name, 'queries', QUERY_BUCKETS
+            ),
+        })
+    return rows
+
+
+def reset():
+    names = cache.get(NAMES_KEY, set())
+    cache.delete_many(
+        [KEY.format(name, field) for name in names for field in TOTALS]
+        + [
+            KEY.format(name, f'{prefix}_{number}')
+            for name in names
+            for prefix, bounds in (
+                ('time', TIME_BUCKETS_MS), ('queries', QUERY_BUCKETS)
+            )
+            for number in range(len(bounds) + 1)
+        ]
+    )
+    cache.delete(NAMES_KEY)
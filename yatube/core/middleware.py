@@ -0,0 +1,147 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from . import compression, metrics, page_cache
+from .caches import is_process_local
+
+
+class RequestMetricsMiddleware:
+    """Считает запросы к базе, время SQL, рендеринга и всего запроса.
+
+    Стоит первым в MIDDLEWARE: так в общее время попадают остальные
+    middleware, а его process_template_response вызывается последним,
+    прямо перед рендерингом TemplateResponse. Ленивые запросы из шаблона
+    учитываются и в SQL, и в рендеринге. При нулевой доле выборки
+    middleware отключается целиком.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        request.metrics = metrics.RequestMetrics()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(request.metrics.record_query)
+                )
+            response = self.get_response(request)
+        request.metrics.finish()
+        response['Server-Timing'] = request.metrics.server_timing()
+        match = request.resolver_match
+        if match is not None and match.url_name:
+            metrics.record(match.view_name, request.metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        request_metrics = getattr(request, 'metrics', None)
+        if request_metrics is None:
+            return response
+        started = time.perf_counter()
+
+        def rendered(response):
+            request_metrics.render = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class CompressionMiddleware:
+    """Сжимает текстовые ответы brotli или gzip по Accept-Encoding.
+
+    Стоит сразу за RequestMetricsMiddleware: остальные middleware видят
+    несжатое тело, а время сжатия входит в метрики. CSRF-токен в формах
+    маскируется заново на каждый запрос, поэтому сжатие HTML не даёт
+    подобрать его атакой BREACH.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.has_header('Content-Encoding')
+                or not compression.compressible(response.get('Content-Type'))):
+            return response
+        if not response.streaming:
+            if len(response.content) < compression.MIN_LENGTH:
+                return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING')
+        )
+        if encoding is None or not self.compress(response, encoding):
+            return response
+        # Сжатое тело отличается побайтно: ETag становится слабым
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def compress(self, response, encoding):
+        if response.streaming:
+            response.streaming_content = compression.compress_chunks(
+                response.streaming_content, encoding
+            )
+            del response['Content-Length']
+            return True
+        compressed = compression.compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return False
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        return True
+
+
+class PageCacheMiddleware:
+    """Отдаёт анонимным посетителям страницы из core.page_cache.
+
+    Стоит последним в MIDDLEWARE: в кеш попадает ответ view, а
+    заголовки внешних middleware добавляются заново и к ответу из кеша.
+    При нулевом PAGE_CACHE_TIMEOUT middleware отключается целиком.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not settings.PAGE_CACHE_TIMEOUT:
+            raise MiddlewareNotUsed
+        if is_process_local():
+            raise ImproperlyConfigured(
+                'Кешу страниц нужен общий для воркеров кеш (redis, '
+                'memcached): в памяти процесса запись поста не '
+                'сбрасывает страницы других воркеров'
+            )
+        self.views = set(settings.PAGE_CACHE_VIEWS)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        key = getattr(request, 'page_cache_key', None)
+        if (key is not None and not getattr(request, 'page_cache_hit', False)
+                and page_cache.cacheable_response(request, response)):
+            page_cache.store(
+                key, response, request.page_cache_generations
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (request.resolver_match.view_name not in self.views
+                or not page_cache.cacheable_request(request)):
+            return None
+        request.page_cache_key = page_cache.page_key(request)
+        response = None
+        if not request.META.get(page_cache.REFRESH_META):
+            response = page_cache.lookup(request, request.page_cache_key)
+        request.page_cache_hit = response is not None
+        if response is None:
+            # View уточнит свои области через page_cache.depends_on
+            page_cache.depends_on(request, page_cache.DEFAULT_SCOPES)
+        return response
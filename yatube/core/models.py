@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Фоновая задача, её выполняют воркеры manage.py run_workers."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField('Задача', max_length=100)
+    payload = models.TextField('Аргументы', default='{}')
+    # Одинаковые задачи в очереди склеиваются в одну
+    dedupe_key = models.CharField(max_length=40)
+    status = models.CharField(
+        'Статус', max_length=10, choices=STATUSES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    run_at = models.DateTimeField('Выполнить после', default=timezone.now)
+    locked_by = models.CharField(max_length=40, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Создана', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=models.Q(status='pending'),
+                name='unique_pending_job'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} {self.payload}'
@@ -0,0 +1,203 @@
+"""Кеш целых страниц для анонимных посетителей.
+
+Кешируются GET-запросы без cookie сессии и сообщений к view из
+PAGE_CACHE_VIEWS: такие запросы анонимны, и страница для них одна и та
+же. Ключ - хост, схема, путь и отсортированные параметры запроса, так
+что ?page=2 и ?page=3 - разные записи. Ответ не сохраняется, если он
+ставит cookie, меняет сессию, использовал CSRF-токен или закрыт
+Cache-Control: private/no-store.
+
+Запись свежая PAGE_CACHE_TIMEOUT секунд, затем ещё
+PAGE_CACHE_STALE_TIMEOUT отдаётся устаревшей, пока задача
+core.refresh_page перерисовывает страницу в воркере; без воркеров
+(JOBS_EAGER) устаревшая запись считается промахом.
+
+View сообщает через depends_on, данные каких областей выводит страница
+(по умолчанию DEFAULT_SCOPES); запись хранит поколения этих областей.
+bump_generation(scopes) сразу делает недействительными только страницы
+затронутых областей. Инвалидация видна всем воркерам только в общем
+кеше, поэтому с кешем в памяти процесса middleware не включается.
+"""
+import hashlib
+import time
+from io import BytesIO
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .jobs import enqueue
+
+GENERATION_KEY = 'core:page_cache:generation:{}'
+PAGE_KEY = 'core:page_cache:page:{}'
+LOCK_KEY = 'core:page_cache:lock:{}'
+STATS_KEY = 'core:page_cache:{}'
+# Пока задача перерисовки ждёт воркера, новая не ставится
+LOCK_TIMEOUT = 60
+# Ключ META запроса перерисовки: из заголовков HTTP его не подделать
+REFRESH_META = 'core.page_cache.refresh'
+# Области страницы, которая не сообщила свои через depends_on
+DEFAULT_SCOPES = ('all',)
+
+
+def generations(scopes):
+    """Текущие поколения областей: {область: поколение}."""
+    keys = {scope: GENERATION_KEY.format(scope) for scope in scopes}
+    found = cache.get_many(keys.values())
+    result = {}
+    for scope, key in keys.items():
+        if key not in found:
+            # Начальное поколение от времени: после вытеснения ключа
+            # не совпадёт с поколениями уже сохранённых страниц
+            cache.add(key, int(time.time() * 1000000), None)
+            found[key] = cache.get(key)
+        result[scope] = found[key]
+    return result
+
+
+def bump_generation(scopes):
+    for scope in scopes:
+        try:
+            cache.incr(GENERATION_KEY.format(scope))
+        except ValueError:
+            pass
+
+
+def depends_on(request, scopes):
+    """Страница запроса выводит данные областей scopes.
+
+    Поколения читаются до построения страницы: запись, сделанная во
+    время рендеринга, не попадёт в кеш под новым поколением.
+    """
+    if getattr(request, 'page_cache_key', None) is not None:
+        request.page_cache_generations = generations(scopes)
+
+
+def cacheable_request(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def cacheable_response(request, response):
+    cache_control = response.get('Cache-Control', '')
+    session = getattr(request, 'session', None)
+    return (
+        request.method == 'GET'
+        and response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_USED')
+        and not (session is not None and session.modified)
+        and 'private' not in cache_control
+        and 'no-store' not in cache_control
+    )
+
+
+def page_key(request):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    raw = ':'.join((
+        request.scheme, request.get_host(), request.path, query,
+    ))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _count(event):
+    key = STATS_KEY.format(event)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def store(key, response, page_generations):
+    """Сохраняет копию ответа без атрибутов рендеринга и клиента."""
+    copy = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        copy[header] = value
+    cache.set(PAGE_KEY.format(key), {
+        'response': copy,
+        'generations': page_generations,
+        'expires': time.time() + settings.PAGE_CACHE_TIMEOUT,
+    }, settings.PAGE_CACHE_TIMEOUT + settings.PAGE_CACHE_STALE_TIMEOUT)
+
+
+def lookup(request, key):
+    """Ответ из кеша или None; устаревший ставит в очередь перерисовку."""
+    entry = cache.get(PAGE_KEY.format(key))
+    if (entry is None
+            or entry['generations'] != generations(entry['generations'])):
+        _count('misses')
+        return None
+    if entry['expires'] <= time.time():
+        if settings.JOBS_EAGER:
+            # Задача выполнилась бы в этом же запросе: рисуем страницу
+            # обычным путём, а не вторым проходом по middleware
+            _count('misses')
+            return None
+        _count('stale')
+        if cache.add(LOCK_KEY.format(key), 1, LOCK_TIMEOUT):
+            enqueue(
+                'core.refresh_page',
+                scheme=request.scheme,
+                host=request.get_host(),
+                path=request.path_info,
+                query=request.META.get('QUERY_STRING', ''),
+            )
+    else:
+        _count('hits')
+    response = entry['response']
+    last_modified = parse_http_date_safe(response.get('Last-Modified', ''))
+    return get_conditional_response(
+        request, etag=response.get('ETag'), last_modified=last_modified,
+        response=response,
+    )
+
+
+class PageRenderer(BaseHandler):
+    """Проводит запрос через все middleware без WSGI-сервера."""
+    def __init__(self):
+        super().__init__()
+        self.load_middleware()
+
+
+def refresh(scheme, host, path, query):
+    """Перерисовывает страницу: ответ сохранит PageCacheMiddleware."""
+    request = WSGIRequest({
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        # WSGI передаёт путь байтами в latin-1
+        'PATH_INFO': path.encode().decode('iso-8859-1'),
+        'QUERY_STRING': query,
+        'HTTP_HOST': host,
+        'SERVER_NAME': host.split(':')[0],
+        'SERVER_PORT': '443' if scheme == 'https' else '80',
+        'wsgi.url_scheme': scheme,
+        'wsgi.input': BytesIO(),
+        REFRESH_META: True,
+    })
+    try:
+        PageRenderer().get_response(request)
+    finally:
+        cache.delete(LOCK_KEY.format(page_key(request)))
+
+
+def stats():
+    events = ('hits', 'stale', 'misses')
+    counters = cache.get_many([STATS_KEY.format(event) for event in events])
+    result = {
+        event: counters.get(STATS_KEY.format(event), 0) for event in events
+    }
+    total = sum(result.values())
+    served = result['hits'] + result['stale']
+    result['hit_ratio'] = served / total if total else 0.0
+    return result
@@ -0,0 +1,45 @@
+import mimetypes
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from . import compression
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешем содержимого в имени и сжатыми копиями рядом.
+
+    Для каждого хешированного текстового файла collectstatic кладёт
+    file.<hash>.css.gz и, если установлен brotli, file.<hash>.css.br.
+    Их отдаёт core.views.serve_static или веб-сервер (gzip_static).
+    """
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = {}
+        processed_files = super().post_process(
+            paths, dry_run=dry_run, **options
+        )
+        for name, hashed_name, processed in processed_files:
+            if hashed_name and not isinstance(processed, Exception):
+                # CSS обрабатывается в несколько проходов, важен последний
+                hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+        if not dry_run:
+            for hashed_name in hashed_names.values():
+                self.save_compressed(hashed_name)
+
+    def save_compressed(self, name):
+        content_type = mimetypes.guess_type(name)[0]
+        if not compression.compressible(content_type):
+            return
+        with self.open(name) as source:
+            data = source.read()
+        if len(data) < compression.MIN_LENGTH:
+            return
+        for encoding in compression.available_encodings():
+            compressed = compression.compress(data, encoding, best=True)
+            if len(compressed) >= len(data):
+                continue
+            path = name + compression.EXTENSIONS[encoding]
+            if self.exists(path):
+                self.delete(path)
+            self._save(path, ContentFile(compressed))
@@ -0,0 +1,8 @@
+"""Фоновые задачи core."""
+from .jobs import task
+from .page_cache import refresh
+
+
+@task('core.refresh_page')
+def refresh_page(scheme, host, path, query):
+    refresh(scheme, host, path, query)
@@ -0,0 +1,42 @@
+"""Предварительная компиляция шаблонов.
+
+С кеширующим загрузчиком скомпилированный шаблон живёт до конца
+процесса, поэтому первые запросы после старта не тратят время
+на чтение и разбор файлов.
+"""
+import os
+
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+def template_names(engine):
+    """Имена всех шаблонов из DIRS и каталогов templates приложений."""
+    dirs = list(engine.engine.dirs) + list(get_app_template_dirs('templates'))
+    names = set()
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    path = os.path.join(root, filename)
+                    names.add(
+                        os.path.relpath(path, directory).replace(os.sep, '/')
+                    )
+    return sorted(names)
+
+
+def warm_templates(using='django'):
+    """Загружает все шаблоны; возвращает (скомпилированные, ошибки)."""
+    engine = engines[using]
+    compiled = []
+    errors = {}
+    for name in template_names(engine):
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError as error:
+            errors[name] = str(error)
+        else:
+            compiled.append(name)
+    return compiled, errors
@@ -0,0 +1,63 @@
+import mimetypes
+import os
+import posixpath
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.shortcuts import redirect, render
+from django.utils.cache import patch_vary_headers
+from django.views.static import serve
+from posts import caching
+
+from . import compression, jobs, metrics, page_cache
+
+
+@staff_member_required
+def request_metrics(request):
+    """Страница админки со сводкой метрик запросов по URL."""
+    if request.method == 'POST':
+        metrics.reset()
+        return redirect('request_metrics')
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Метрики запросов',
+        'rows': metrics.summary(),
+        'feed_cache': caching.stats(),
+        'page_cache': page_cache.stats(),
+        'jobs': jobs.queue_stats(),
+    }
+    return render(request, 'core/metrics.html', context)
+
+
+def serve_static(request, path):
+    """Отдаёт собранную collectstatic статику, если перед Django нет
+    веб-сервера.
+
+    Клиенту, принимающему сжатие, отдаётся готовая копия .br или .gz.
+    Файлы с хешем в имени не меняются, поэтому кешируются надолго.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    name, encoding = path, None
+    accepted = compression.accepted_encodings(
+        request.META.get('HTTP_ACCEPT_ENCODING')
+    )
+    for candidate in compression.available_encodings():
+        compressed = path + compression.EXTENSIONS[candidate]
+        if (compression.accepts(accepted, candidate)
+                and os.path.isfile(os.path.join(settings.STATIC_ROOT,
+                                                compressed))):
+            name, encoding = compressed, candidate
+            break
+    response = serve(request, name, document_root=settings.STATIC_ROOT)
+    if encoding is not None and response.status_code == 200:
+        response['Content-Type'] = (
+            mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        )
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    if path in hashed_files.values():
+        response['Cache-Control'] = settings.STATIC_CACHE_CONTROL
+    return response
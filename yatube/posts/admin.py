@@ -1,5 +1,9 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import StreamingHttpResponse
+from django.urls import path
 
+from .export import EXPORT_FORMATS, export_rows
 from .models import Group, Post
 
 
@@ -10,8 +14,40 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
+
+    def get_urls(self):
+        urls = [
+            path(
+                'export/',
+                self.admin_site.admin_view(self.export_view),
+                name='posts_post_export'
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def export_view(self, request):
+        """Потоковая выгрузка всех постов: ?format=jsonl или csv."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        fmt = request.GET.get('format', 'jsonl')
+        if fmt not in EXPORT_FORMATS:
+            fmt = 'jsonl'
+        lines, content_type = EXPORT_FORMATS[fmt]
+        response = StreamingHttpResponse(
+            lines(export_rows()), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="posts.{fmt}"'
+        )
+        return response
+
 
 class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug', 'post_count', 'last_post_date')
     prepopulated_fields = {"slug": ("title",)}
 
 
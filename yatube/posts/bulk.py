@@ -0,0 +1,133 @@
+"""Пакетное создание постов через JSON API.
+
+Каждый пост пакета проверяется той же формой, что и на странице
+создания поста; группы всего пакета загружаются одним запросом.
+Пакет создаётся целиком или не создаётся вовсе: одна ошибка - и
+ответ 400 с ошибками по номерам постов. Посты вставляются одним
+bulk_create в транзакции, а побочные эффекты сигналов post_save -
+счётчики, раздача по лентам, версии кеша лент - выполняются один раз
+на пакет.
+"""
+import json
+
+from django import forms
+from django.conf import settings
+from django.db import transaction
+
+from core.jobs import enqueue
+
+from .caching import bump_feed_versions, post_scopes
+from .counts import change_counters, shift_author_count, shift_group_count
+from .forms import PostForm
+from .models import Group, Post
+from .validators import clean_text
+
+
+class PrefetchedGroupField(forms.ModelChoiceField):
+    """Выбор группы из заранее загруженного словаря, без запроса."""
+    def __init__(self, groups, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.groups = groups
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return self.groups[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+            )
+
+
+class BulkPostForm(PostForm):
+    clean_text = clean_text
+
+    def __init__(self, *args, groups, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields['group']
+        self.fields['group'] = PrefetchedGroupField(
+            groups,
+            queryset=field.queryset,
+            required=field.required,
+            label=field.label,
+        )
+
+    def _get_validation_exclusions(self):
+        # Группа уже найдена в словаре: без этого full_clean модели
+        # проверял бы её существование запросом на каждый пост
+        return super()._get_validation_exclusions() + ['group']
+
+
+def parse_items(body):
+    """Список постов из тела запроса: [...] или {"posts": [...]}."""
+    try:
+        items = json.loads(body)
+    except ValueError:
+        raise ValueError('Тело запроса - не JSON')
+    if isinstance(items, dict):
+        items = items.get('posts')
+    if not isinstance(items, list) or not items:
+        raise ValueError('Ожидается непустой список постов')
+    if len(items) > settings.POSTS_BULK_LIMIT:
+        raise ValueError(
+            f'Не больше {settings.POSTS_BULK_LIMIT} постов за запрос'
+        )
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError('Каждый пост - объект с полями text и group')
+    return items
+
+
+def group_ids(items):
+    ids = set()
+    for item in items:
+        try:
+            ids.add(int(item.get('group')))
+        except (TypeError, ValueError):
+            pass
+    return ids
+
+
+def build_forms(items):
+    """Формы всех постов пакета; группы - одним запросом."""
+    groups = Group.objects.in_bulk(group_ids(items))
+    return [BulkPostForm(item, groups=groups) for item in items]
+
+
+def errors(post_forms):
+    """Ошибки по номерам постов в пакете; пустой словарь - всё верно."""
+    return {
+        index: form.errors.get_json_data()
+        for index, form in enumerate(post_forms)
+        if not form.is_valid()
+    }
+
+
+def create_posts(author, post_forms):
+    """Создаёт посты проверенных форм и возвращает их id по порядку."""
+    posts = []
+    for form in post_forms:
+        post = form.save(commit=False)
+        post.author = author
+        posts.append(post)
+    groups = {}
+    with transaction.atomic():
+        Post.objects.bulk_create(posts)
+        # bulk_create не отправляет сигналы: счётчики сдвигаем и задачу
+        # ставим за весь пакет в той же транзакции
+        for post in posts:
+            count, pub_date = groups.get(post.group_id, (0, post.pub_date))
+            groups[post.group_id] = (count + 1, max(pub_date, post.pub_date))
+        for group_id, (count, pub_date) in groups.items():
+            shift_group_count(group_id, count, pub_date)
+        shift_author_count(author.pk, len(posts))
+        enqueue(
+            'posts.fan_out_posts', post_ids=[post.pk for post in posts]
+        )
+    change_counters(['all'], len(posts))
+    scopes = set()
+    for post in posts:
+        scopes.update(post_scopes(post.group_id, post.author_id))
+    bump_feed_versions(scopes)
+    return [post.pk for post in posts]
@@ -0,0 +1,171 @@
+"""Кеш отрендеренных фрагментов лент.
+
+Ключ фрагмента - (область ленты, версия области, страница). Сигналы
+поста поднимают версии только затронутых областей: главной ленты,
+группы и автора, поэтому старые фрагменты просто перестают читаться.
+Те же версии служат основой ETag для условных GET-запросов.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core import page_cache
+
+from .counts import author_scope, group_scope
+
+VERSION_KEY = 'posts:feed_version:{}'
+FRAGMENT_KEY = 'posts:feed:{}:{}:{}'
+STATS_KEY = 'posts:feed_cache:{}'
+MODIFIED_KEY = 'posts:feed_modified:{}'
+
+
+def post_scopes(group_id, author_id):
+    """Области лент, в которые попадает пост."""
+    scopes = ['all', author_scope(author_id)]
+    if group_id is not None:
+        scopes.append(group_scope(group_id))
+    return scopes
+
+
+def feed_version(scope):
+    key = VERSION_KEY.format(scope)
+    version = cache.get(key)
+    if version is None:
+        # Начальная версия от времени: после вытеснения ключа
+        # не совпадёт с версиями уже лежащих в кеше фрагментов
+        cache.add(key, int(time.time() * 1000000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_feed_versions(scopes):
+    for scope in scopes:
+        try:
+            cache.incr(VERSION_KEY.format(scope))
+        except ValueError:
+            pass
+    modified = timezone.now()
+    cache.set_many(
+        {MODIFIED_KEY.format(scope): modified for scope in scopes}, None
+    )
+    # Закешированные страницы этих лент устарели
+    page_cache.bump_generation(scopes)
+
+
+def feed_last_modified(scope, queryset):
+    """Время последнего изменения ленты, без загрузки самих постов."""
+    key = MODIFIED_KEY.format(scope)
+    modified = cache.get(key)
+    if modified is None:
+        modified = queryset.aggregate(modified=Max('updated_at'))['modified']
+        if modified is not None:
+            cache.add(key, modified, None)
+    return modified
+
+
+def scopes_last_modified(scopes, modified):
+    """Время изменения страницы, которая выводит данные областей scopes.
+
+    Время смены области берётся из кеша. Если его там нет, область
+    считается изменённой сейчас: лишний ответ 200 лучше устаревшего 304.
+    """
+    keys = [MODIFIED_KEY.format(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    now = timezone.now()
+    for key in keys:
+        if key not in found:
+            cache.add(key, now, None)
+            found[key] = cache.get(key, now)
+    return max([modified, *found.values()])
+
+
+def feed_etag(request, scope, variant=''):
+    """ETag страницы ленты; variant - то, что страница выводит
+    помимо постов ленты (например, кнопка подписки в профиле).
+    """
+    raw = ':'.join((
+        scope,
+        str(feed_version(scope)),
+        request.GET.urlencode(),
+        str(request.user.pk or 0),
+        variant,
+    ))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def conditional_response(request, etag, last_modified, render):
+    """Отвечает 304, если у клиента актуальная версия страницы.
+
+    Шапка страницы зависит от пользователя, поэтому для авторизованных
+    сверяется только ETag, в который входит id пользователя.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return render()
+    etag = quote_etag(etag)
+    timestamp = None
+    if last_modified is not None and not request.user.is_authenticated:
+        timestamp = int(last_modified.timestamp())
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+    if response is None:
+        response = render()
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+def page_key(page_obj):
+    """Номер страницы или хеш курсора: курсор приходит от клиента,
+    и его длина не должна попадать в ключ кеша.
+    """
+    number = getattr(page_obj, 'number', None)
+    if number is not None:
+        return number
+    return 'c' + hashlib.md5((page_obj.cursor or '').encode()).hexdigest()
+
+
+def _count(event):
+    key = STATS_KEY.format(event)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def cached_fragment(scope, page_obj, render):
+    """Возвращает HTML страницы ленты из кеша или рендерит его."""
+    timeout = settings.FEED_CACHE_TIMEOUT
+    if not timeout:
+        return render()
+    key = FRAGMENT_KEY.format(scope, feed_version(scope), page_key(page_obj))
+    html = cache.get(key)
+    if html is not None:
+        _count('hits')
+        return html
+    _count('misses')
+    html = render()
+    cache.set(key, html, timeout)
+    return html
+
+
+def stats():
+    counters = cache.get_many(
+        [STATS_KEY.format('hits'), STATS_KEY.format('misses')]
+    )
+    hits = counters.get(STATS_KEY.format('hits'), 0)
+    misses = counters.get(STATS_KEY.format('misses'), 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
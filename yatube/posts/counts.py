@@ -0,0 +1,218 @@
+"""Стратегии подсчёта постов для пагинатора лент.
+
+Область подсчёта (scope) - строка: 'all' для всей ленты,
+'group:<id>' и 'author:<id>' для ленты группы и автора.
+Для групп и авторов число постов хранится в колонках post_count,
+у групп рядом - дата последнего поста для каталога групп. Счётчик
+всей ленты - строка FeedCounter. Сигналы постов сдвигают счётчики
+на каждой записи; recount_posts пересчитывает их целиком, если они
+разошлись с таблицей постов.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, models, transaction
+from django.db.models.functions import Coalesce, Greatest
+from users.models import Profile
+
+from .groups import forget_groups
+from .models import FeedCounter, Group, Post, User
+
+CACHED_COUNT_KEY = 'posts:count:{}'
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def change_counters(scopes, delta):
+    """Сдвигает счётчики лент в базе, если они уже заведены.
+
+    Отсутствующий счётчик не создаём: он будет посчитан
+    при следующем чтении.
+    """
+    counters = FeedCounter.objects.filter(scope__in=scopes)
+    if delta < 0:
+        counters = counters.filter(post_count__gte=-delta)
+    counters.update(post_count=models.F('post_count') + delta)
+
+
+def _shift(queryset, delta, **fields):
+    if delta < 0:
+        queryset = queryset.filter(post_count__gte=-delta)
+    queryset.update(post_count=models.F('post_count') + delta, **fields)
+
+
+def shift_group_count(group_id, delta, pub_date):
+    """Сдвигает post_count группы на delta постов с датой не позже pub_date.
+
+    Новые посты двигают last_post_date вперёд. Если ушёл последний пост,
+    предыдущий берётся одним проходом по индексу (group, pub_date),
+    без пересчёта всех постов группы.
+    """
+    if group_id is None:
+        return
+    pub_date = models.Value(pub_date, output_field=models.DateTimeField())
+    if delta > 0:
+        last_post_date = Greatest(
+            Coalesce('last_post_date', pub_date), pub_date
+        )
+    else:
+        latest = (
+            Post.objects.filter(group_id=group_id)
+            .order_by('-pub_date').values('pub_date')[:1]
+        )
+        last_post_date = models.Case(
+            models.When(
+                last_post_date__gt=pub_date, then=models.F('last_post_date')
+            ),
+            default=models.Subquery(latest),
+        )
+    groups = Group.objects.filter(pk=group_id)
+    _shift(groups, delta, last_post_date=last_post_date)
+    slugs = list(groups.values_list('slug', flat=True))
+    transaction.on_commit(lambda: forget_groups(slugs))
+
+
+def shift_author_count(author_id, delta):
+    _shift(Profile.objects.filter(user_id=author_id), delta)
+
+
+def recount_post_counts():
+    """Пересчитывает post_count групп и авторов одним UPDATE на таблицу
+    и даты последних постов групп.
+    """
+    Profile.objects.bulk_create(
+        Profile(user_id=user_id)
+        for user_id in User.objects.filter(profile__isnull=True)
+        .values_list('pk', flat=True)
+    )
+    latest = (
+        Post.objects.filter(group=models.OuterRef('pk'))
+        .order_by('-pub_date').values('pub_date')[:1]
+    )
+    Group.objects.update(last_post_date=models.Subquery(latest))
+    updated = {}
+    for model, field, key in ((Group, 'group', 'pk'),
+                              (Profile, 'author', 'user_id')):
+        counts = (
+            Post.objects.filter(**{field: models.OuterRef(key)})
+            .order_by().values(field)
+            .annotate(total=models.Count('pk')).values('total')
+        )
+        updated[model._meta.verbose_name_plural] = model.objects.update(
+            post_count=Coalesce(
+                models.Subquery(counts, output_field=models.IntegerField()),
+                0,
+            )
+        )
+    FeedCounter.objects.update_or_create(
+        scope='all', defaults={'post_count': Post.objects.count()}
+    )
+    forget_groups(Group.objects.values_list('slug', flat=True))
+    return updated
+
+
+def exact_count(queryset, scope):
+    return queryset.count()
+
+
+def column_count(scope):
+    """post_count группы или автора, None для всей ленты."""
+    kind, _, pk = scope.partition(':')
+    if kind == 'group':
+        counts = Group.objects.filter(pk=pk)
+    elif kind == 'author':
+        counts = Profile.objects.filter(user_id=pk)
+    else:
+        return None
+    return counts.values_list('post_count', flat=True).first()
+
+
+def counter_count(queryset, scope):
+    """Колонка post_count для групп и авторов, для всей ленты -
+    строка FeedCounter, поддерживаемая сигналами.
+    """
+    count = column_count(scope)
+    if count is not None:
+        return count
+    count = FeedCounter.objects.filter(scope=scope).values_list(
+        'post_count', flat=True
+    ).first()
+    if count is None:
+        count = queryset.count()
+        # Счётчик мог завести параллельный запрос: его строка остаётся
+        FeedCounter.objects.bulk_create(
+            [FeedCounter(scope=scope, post_count=count)],
+            ignore_conflicts=True,
+        )
+    return count
+
+
+def cached_count(queryset, scope):
+    """Точный COUNT(*), закешированный на POSTS_COUNT_CACHE_TTL секунд."""
+    return cache.get_or_set(
+        CACHED_COUNT_KEY.format(scope),
+        queryset.count,
+        settings.POSTS_COUNT_CACHE_TTL,
+    )
+
+
+def table_estimate(model):
+    """Оценка числа строк из статистики планировщика, без сканирования."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        try:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class '
+                    'WHERE relname = %s', [table]
+                )
+                row = cursor.fetchone()
+                if row and row[0] > 0:
+                    return row[0]
+            elif connection.vendor == 'sqlite':
+                # sqlite_stat1 заполняется командой ANALYZE
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                    [table]
+                )
+                row = cursor.fetchone()
+                if row:
+                    return int(row[0].split()[0])
+        except DatabaseError:
+            pass
+        # Максимальный id читается из первичного ключа без скана
+        cursor.execute(
+            'SELECT MAX({}) FROM {}'.format(
+                connection.ops.quote_name(model._meta.pk.column),
+                connection.ops.quote_name(table),
+            )
+        )
+        return cursor.fetchone()[0] or 0
+
+
+def estimated_count(queryset, scope):
+    """Оценка для всей ленты, счётчики для групп и авторов."""
+    if scope == 'all':
+        return table_estimate(queryset.model)
+    return counter_count(queryset, scope)
+
+
+COUNT_STRATEGIES = {
+    'exact': exact_count,
+    'counter': counter_count,
+    'cached': cached_count,
+    'estimated': estimated_count,
+}
+
+
+def get_count_func(queryset, scope):
+    """Функция подсчёта для пагинатора по настройке POSTS_COUNT_STRATEGY."""
+    if scope is None:
+        return queryset.count
+    strategy = COUNT_STRATEGIES[settings.POSTS_COUNT_STRATEGY]
+    return lambda: strategy(queryset, scope)
@@ -0,0 +1,107 @@
+"""Кеш страницы поста: пост с автором, профилем и группой.
+
+Запись в кеше - пост, загруженный одним запросом с select_related, и
+версии областей автора и группы на момент загрузки. Сигналы поста
+удаляют запись при редактировании и удалении, а смена имени автора,
+его числа постов или названия группы поднимает версию области, и
+запись перестаёт считаться актуальной.
+
+После мягкого срока жизни запись пересчитывает только один запрос,
+взявший блокировку; остальные в это время отдают прежнюю версию. Если
+записи нет вовсе, они ждут его результат и лишь потом идут в базу
+сами, поэтому истечение популярного поста не даёт всплеска запросов.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from users.models import get_profile
+
+from .caching import feed_version
+from .counts import author_scope, group_scope
+from .models import Post
+
+DETAIL_KEY = 'posts:detail:{}'
+LOCK_KEY = 'posts:detail_lock:{}'
+# Устаревшая запись хранится ещё столько же, сколько была свежей
+STALE_FACTOR = 2
+LOCK_TIMEOUT = 10
+# Сколько ждать пересчёта другим запросом: шаги по WAIT_INTERVAL секунд
+WAIT_STEPS = 20
+WAIT_INTERVAL = 0.05
+
+
+def detail_scopes(post):
+    scopes = [author_scope(post.author_id)]
+    if post.group_id is not None:
+        scopes.append(group_scope(post.group_id))
+    return scopes
+
+
+def scope_versions(scopes):
+    return {scope: feed_version(scope) for scope in scopes}
+
+
+def is_current(entry):
+    return entry['versions'] == scope_versions(entry['versions'])
+
+
+def load_post(post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('author__profile', 'group'), pk=post_id
+    )
+    get_profile(post.author)
+    return post
+
+
+def refresh(post_id):
+    timeout = settings.POST_DETAIL_CACHE_TIMEOUT
+    post = load_post(post_id)
+    cache.set(DETAIL_KEY.format(post_id), {
+        'post': post,
+        'versions': scope_versions(detail_scopes(post)),
+        'expires': time.time() + timeout,
+    }, timeout * STALE_FACTOR)
+    return post
+
+
+def single_flight(post_id, stale=None):
+    """Пересчёт одним запросом: остальные отдают stale или ждут."""
+    lock = LOCK_KEY.format(post_id)
+    token = uuid.uuid4().hex
+    if cache.add(lock, token, LOCK_TIMEOUT):
+        try:
+            return refresh(post_id)
+        finally:
+            if cache.get(lock) == token:
+                cache.delete(lock)
+    if stale is not None:
+        return stale
+    for _ in range(WAIT_STEPS):
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(DETAIL_KEY.format(post_id))
+        if entry is not None and is_current(entry):
+            return entry['post']
+        if cache.get(lock) is None:
+            # Пересчёт закончился без записи: например, поста уже нет
+            break
+    # Не дождались: читаем сами, не трогая чужую блокировку
+    return load_post(post_id)
+
+
+def get_post(post_id):
+    """Пост для страницы поста, с автором, профилем и группой."""
+    if not settings.POST_DETAIL_CACHE_TIMEOUT:
+        return load_post(post_id)
+    entry = cache.get(DETAIL_KEY.format(post_id))
+    if entry is None or not is_current(entry):
+        return single_flight(post_id)
+    if entry['expires'] <= time.time():
+        return single_flight(post_id, stale=entry['post'])
+    return entry['post']
+
+
+def forget_post(post_id):
+    cache.delete(DETAIL_KEY.format(post_id))
@@ -0,0 +1,49 @@
+"""Потоковая выгрузка постов в JSONL и CSV.
+
+Формат строк совпадает с тем, что принимает import_posts.
+"""
+import csv
+import json
+
+from .models import Post
+
+EXPORT_FIELDS = ('id', 'text', 'author', 'group', 'pub_date')
+
+
+def export_rows(chunk_size=2000):
+    """Строки выгрузки: посты читаются с сервера кусками по chunk_size."""
+    posts = Post.objects.order_by('pk').values_list(
+        'pk', 'text', 'author__username', 'group__slug', 'pub_date'
+    )
+    for pk, text, author, group, pub_date in posts.iterator(chunk_size):
+        yield {
+            'id': pk,
+            'text': text,
+            'author': author,
+            'group': group or '',
+            'pub_date': pub_date.isoformat(),
+        }
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+class Echo:
+    """Псевдофайл для csv.writer: возвращает строку вместо записи."""
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    'jsonl': (jsonl_lines, 'application/x-ndjson'),
+    'csv': (csv_lines, 'text/csv'),
+}
@@ -0,0 +1,35 @@
+"""Кеш групп по slug.
+
+Лента группы берёт из кеша заголовок, описание и post_count вместо
+запроса к posts_group на каждую страницу. Запись удаляется сигналами
+при сохранении и удалении группы (в том числе из админки) и после
+пересчёта post_count и last_post_date. Slug в ключе заменён хешем:
+ключ не зависит от длины и символов slug и годится для memcached.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+
+from .models import Group
+
+GROUP_KEY = 'posts:group:{}'
+
+
+def group_key(slug):
+    return GROUP_KEY.format(hashlib.md5(slug.encode()).hexdigest())
+
+
+def get_group(slug):
+    """Группа по slug из кеша или из базы; 404, если её нет."""
+    key = group_key(slug)
+    group = cache.get(key)
+    if group is None:
+        group = get_object_or_404(Group, slug=slug)
+        cache.set(key, group, settings.GROUP_CACHE_TIMEOUT)
+    return group
+
+
+def forget_groups(slugs):
+    cache.delete_many([group_key(slug) for slug in slugs if slug])
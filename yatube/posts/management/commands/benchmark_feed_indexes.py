@@ -0,0 +1,104 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from core.benchmarks.database import benchmark_database
+from posts.models import Group, Post, User
+
+BATCH_SIZE = 10000
+# Индексы, которые были на posts_post до составных
+LEGACY_INDEXES = [
+    models.Index(fields=['author'], name='bench_author_idx'),
+    models.Index(fields=['group'], name='bench_group_idx'),
+]
+
+
+def feed_queries(group, author):
+    return {
+        'index': Post.objects.for_feed(),
+        'group_posts': group.posts.for_feed(),
+        'profile': author.posts.for_feed(),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Заполняет временную тестовую базу постами и показывает планы '
+            'и время запросов лент с составными индексами и без них')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1000,100000,1000000',
+            help='Размеры таблицы постов через запятую'
+        )
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        with benchmark_database():
+            self.run(sizes, options['repeat'])
+
+    def run(self, sizes, repeat):
+        authors = [
+            User.objects.create_user(username=f'bench_{i}') for i in range(10)
+        ]
+        groups = [
+            Group.objects.create(title=f'bench_{i}', slug=f'bench-{i}')
+            for i in range(10)
+        ]
+        seeded = 0
+        for size in sizes:
+            self.seed(seeded, size, authors, groups)
+            seeded = size
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{size} постов'))
+            queries = feed_queries(groups[0], authors[0])
+            for name, queryset in queries.items():
+                page = queryset[:10]
+                self.stdout.write(f'{name}: {self.measure(page, repeat)}')
+                for line in page.explain().splitlines():
+                    self.stdout.write(f'    {line}')
+            with self.without_feed_indexes():
+                for name, queryset in queries.items():
+                    timing = self.measure(queryset[:10], repeat)
+                    self.stdout.write(
+                        f'{name} без составных индексов: {timing}'
+                    )
+
+    def seed(self, start, stop, authors, groups):
+        for offset in range(start, stop, BATCH_SIZE):
+            with transaction.atomic():
+                Post.objects.bulk_create(
+                    Post(
+                        text=f'Пост {i}',
+                        author=authors[i % len(authors)],
+                        group=groups[i % len(groups)],
+                    )
+                    for i in range(offset, min(offset + BATCH_SIZE, stop))
+                )
+
+    def measure(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        return f'медиана {statistics.median(timings):.2f} мс'
+
+    @contextmanager
+    def without_feed_indexes(self):
+        """Временно возвращает схему индексов, бывшую до составных."""
+        with connection.schema_editor() as editor:
+            for index in Post._meta.indexes:
+                editor.remove_index(Post, index)
+            for index in LEGACY_INDEXES:
+                editor.add_index(Post, index)
+        try:
+            yield
+        finally:
+            with connection.schema_editor() as editor:
+                for index in LEGACY_INDEXES:
+                    editor.remove_index(Post, index)
+                for index in Post._meta.indexes:
+                    editor.add_index(Post, index)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from posts.export import EXPORT_FORMATS, export_rows
+
+
+class Command(BaseCommand):
+    help = 'Выгружает все посты в JSONL или CSV, не держа их в памяти'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS,
+                            default='jsonl')
+        parser.add_argument('--output', default='-',
+                            help='Файл для выгрузки, - для stdout')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        lines, _ = EXPORT_FORMATS[options['format']]
+        lines = lines(export_rows(options['chunk_size']))
+        if options['output'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(lines)
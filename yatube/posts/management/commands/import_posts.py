@@ -0,0 +1,46 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.importing import READERS, PostImporter
+
+
+class Command(BaseCommand):
+    help = ('Загружает посты из JSONL или CSV (поля text, author, group, '
+            'pub_date) пачками через bulk_create')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с постами, - для stdin')
+        parser.add_argument('--format', choices=READERS)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or path.rsplit('.', 1)[-1]
+        if fmt not in READERS:
+            raise CommandError('Укажите формат: --format jsonl или csv')
+        importer = PostImporter(options['batch_size'])
+        started = time.perf_counter()
+
+        def progress(imported):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{imported} постов, {imported / elapsed:.0f} в сек.'
+            )
+
+        stream = (
+            sys.stdin if path == '-'
+            else open(path, encoding='utf-8', newline='')
+        )
+        try:
+            importer.run(READERS[fmt](stream), progress)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - started
+        rate = importer.imported / max(elapsed, 1e-9)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {importer.imported}, пропущено {importer.skipped} '
+            f'за {elapsed:.1f} с ({rate:.0f} в сек.)'
+        ))
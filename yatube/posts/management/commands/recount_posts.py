@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from posts.counts import recount_post_counts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованные счётчики постов групп и авторов'
+
+    def handle(self, *args, **options):
+        updated = recount_post_counts()
+        for name, rows in updated.items():
+            self.stdout.write(f'{name}: обновлено {rows}')
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Заполняет text_html и excerpt постов: после миграции '
+            'и после изменения правил разметки')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перерисовать все посты, а не только пустые'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('pk').only('pk', 'text')
+        if not options['all']:
+            posts = posts.filter(text_html='')
+        batch_size = options['batch_size']
+        rendered = 0
+        last_pk = 0
+        while True:
+            # Пачки по pk: обновлённые строки не сдвигают выборку
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for post in batch:
+                post.render_text()
+            Post.objects.bulk_update(batch, ['text_html', 'excerpt'])
+            rendered += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f'{rendered} постов')
+        self.stdout.write(self.style.SUCCESS(f'Обработано постов: {rendered}'))
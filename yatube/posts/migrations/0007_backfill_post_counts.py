@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_post_counts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Group = apps.get_model('posts', 'Group')
+    Profile = apps.get_model('users', 'Profile')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Profile.objects.bulk_create(
+        Profile(user_id=user_id)
+        for user_id in User.objects.filter(profile__isnull=True)
+        .values_list('pk', flat=True)
+    )
+    for model, field in ((Group, 'group'), (Profile, 'author')):
+        key = 'pk' if model is Group else 'user_id'
+        counts = (
+            Post.objects.filter(**{field: models.OuterRef(key)})
+            .order_by().values(field)
+            .annotate(total=models.Count('pk')).values('total')
+        )
+        model.objects.update(post_count=Coalesce(
+            models.Subquery(counts, output_field=models.IntegerField()), 0
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_group_post_count'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_post_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:05
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+# Копия posts.models.EXCERPT_LENGTH на момент миграции
+EXCERPT_LENGTH = 30
+
+
+def render_post_text(apps, schema_editor):
+    """Заполняет text_html и excerpt уже существующих постов пачками
+    по pk, без загрузки всей таблицы в память.
+    """
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(
+            posts.filter(pk__gt=last_pk).only('pk', 'text')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for post in batch:
+            post.text_html = linebreaksbr(post.text, autoescape=True)
+            post.excerpt = Truncator(post.text).chars(EXCERPT_LENGTH)
+        posts.bulk_update(batch, ['text_html', 'excerpt'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(default='', editable=False, max_length=30, verbose_name='Отрывок'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(default='', editable=False, verbose_name='HTML текста'),
+        ),
+        migrations.RunPython(render_post_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:12
+
+from django.db import migrations, models
+
+
+def backfill_last_post_date(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Group = apps.get_model('posts', 'Group')
+    latest = (
+        Post.objects.filter(group=models.OuterRef('pk'))
+        .order_by('-pub_date').values('pub_date')[:1]
+    )
+    Group.objects.update(last_post_date=models.Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_text_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='last_post_date',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата последнего поста'),
+        ),
+        migrations.RunPython(
+            backfill_last_post_date, migrations.RunPython.noop
+        ),
+    ]
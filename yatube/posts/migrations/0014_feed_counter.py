@@ -0,0 +1,24 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_group_last_post_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedCounter',
+            fields=[
+                ('scope', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Область ленты')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Количество постов')),
+            ],
+            options={
+                'verbose_name': 'Счётчик ленты',
+                'verbose_name_plural': 'Счётчики лент',
+            },
+        ),
+    ]
@@ -1,18 +1,82 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connections, models, transaction
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
 
 User = get_user_model()
 
+# Поля, которые нужны шаблонам ленты: остальные колонки не загружаются
+FEED_FIELDS = (
+    'text_html', 'pub_date',
+    'author', 'author__username', 'author__first_name', 'author__last_name',
+    'group', 'group__slug', 'group__title',
+)
+
+
+EXCERPT_LENGTH = 30
+
+
+def render_text(text):
+    """HTML текста и отрывок - то же, что linebreaksbr и truncatechars."""
+    return (
+        linebreaksbr(text, autoescape=True),
+        Truncator(text).chars(EXCERPT_LENGTH),
+    )
+
 
 class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     description = models.TextField()
+    post_count = models.PositiveIntegerField(
+        'Количество постов',
+        default=0,
+        editable=False
+    )
+    # Пересчитывается вместе с post_count после записи постов группы
+    last_post_date = models.DateTimeField(
+        'Дата последнего поста',
+        null=True,
+        blank=True,
+        editable=False
+    )
 
     def __str__(self):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        """bulk_create не вызывает save(): HTML текста готовим здесь.
+
+        SQLite не возвращает id вставленных строк. Пока транзакция
+        держит блокировку записи, других вставок нет, и последние
+        len(objs) постов - это вставленные, в том же порядке.
+        """
+        objs = list(objs)
+        for post in objs:
+            post.render_text()
+        with transaction.atomic(using=self.db, savepoint=False):
+            super().bulk_create(objs, batch_size, ignore_conflicts)
+            if (objs and objs[-1].pk is None and not ignore_conflicts
+                    and connections[self.db].vendor == 'sqlite'):
+                ids = self.model._base_manager.using(self.db).order_by(
+                    '-pk'
+                ).values_list('pk', flat=True)[:len(objs)]
+                for post, pk in zip(objs, reversed(list(ids))):
+                    post.pk = pk
+        return objs
+
+    def for_feed(self):
+        """Посты для страниц-списков: автор и группа одним запросом."""
+        return self.select_related('author', 'group').only(*FEED_FIELDS)
+
+    def search(self, query):
+        """Полнотекстовый поиск, отсортированный по релевантности."""
+        from .search import search_posts
+        return search_posts(self, query)
+
+
 class Post(models.Model):
     text = models.TextField(
         'Текст поста',
@@ -22,12 +86,29 @@ class Post(models.Model):
         'Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
+    # Готовый HTML текста: страницы выводят строку без фильтров
+    text_html = models.TextField(
+        'HTML текста',
+        default='',
+        editable=False
+    )
+    excerpt = models.CharField(
+        'Отрывок',
+        max_length=EXCERPT_LENGTH,
+        default='',
+        editable=False
+    )
     group = models.ForeignKey(
         Group,
         blank=True,
         null=True,
         on_delete=models.SET_NULL,
         related_name='posts',
+        db_index=False,
         verbose_name='Группа',
         help_text='Группа, к которой будет относиться пост'
     )
@@ -35,11 +116,130 @@ class Post(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name='posts',
+        db_index=False,
         verbose_name='Автор'
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
-        ordering = ['-pub_date']
+        ordering = ['-pub_date', '-pk']
+        # Индексы под ленты: фильтр и сортировка без временной сортировки,
+        # отдельные индексы по author и group ими покрываются
+        indexes = [
+            models.Index(fields=['-pub_date', '-id'], name='post_feed_idx'),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_feed_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+    def render_text(self):
+        self.text_html, self.excerpt = render_text(self.text)
+
+    def save(self, *args, **kwargs):
+        self.render_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'text_html', 'excerpt'}
+        super().save(*args, **kwargs)
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower',
+        db_index=False,
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Автор'
+    )
+
+    class Meta:
+        verbose_name = 'Подписка'
+        verbose_name_plural = 'Подписки'
+        # Индекс ограничения покрывает и выборку подписок пользователя
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'], name='unique_follow'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='no_self_follow'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user} -> {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """Строка ленты подписок: пост автора, на которого подписан user.
+
+    Дата публикации и автор скопированы из поста, чтобы страница ленты
+    читалась одним проходом по индексу timeline_feed_idx.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        db_index=False
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False
+    )
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'], name='unique_timeline_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date', '-post'],
+                name='timeline_feed_idx'
+            ),
+            models.Index(
+                fields=['user', 'author'], name='timeline_author_idx'
+            ),
+        ]
+
+
+class FeedCounter(models.Model):
+    """Число постов ленты, у которой нет своей колонки post_count.
+
+    Сейчас это только вся лента ('all'). Счётчик сдвигается сигналами
+    постов через F() и переживает перезапуск и вытеснение кеша; команда
+    recount_posts сверяет его с таблицей постов.
+    """
+    scope = models.CharField('Область ленты', max_length=50, primary_key=True)
+    post_count = models.PositiveIntegerField('Количество постов', default=0)
+
+    class Meta:
+        verbose_name = 'Счётчик ленты'
+        verbose_name_plural = 'Счётчики лент'
+
+    def __str__(self):
+        return f'{self.scope}: {self.post_count}'
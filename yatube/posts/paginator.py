@@ -1,9 +1,161 @@
+import base64
+import binascii
+import json
+
 from django.conf import settings
 from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .counts import get_count_func
+
+
+def encode_cursor(post, backwards=False):
+    """Непрозрачный токен с позицией поста в ленте (pub_date, id)."""
+    data = {'d': post.pub_date.isoformat(), 'i': post.pk}
+    if backwards:
+        data['b'] = 1
+    raw = json.dumps(data, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+# Наибольшее значение INTEGER в SQLite и bigint в PostgreSQL
+MAX_ID = 2 ** 63 - 1
+CURSOR_KEYS = ({'d', 'i'}, {'d', 'i', 'b'})
+
+
+def decode_cursor(token):
+    """Возвращает (pub_date, id, backwards) или None для битого токена.
+
+    Токен приходит от клиента: принимаются только ключи, которые
+    пишет encode_cursor, id в пределах INTEGER базы и дата с часовым
+    поясом, которую можно перевести в UTC.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        data = json.loads(raw.decode())
+        if not isinstance(data, dict) or set(data) not in CURSOR_KEYS:
+            return None
+        pk, backwards = data['i'], data.get('b', 1)
+        if (type(pk) is not int or not 0 < pk <= MAX_ID
+                or backwards != 1):
+            return None
+        pub_date = parse_datetime(data['d'])
+        if pub_date is None or timezone.is_naive(pub_date):
+            return None
+        pub_date = pub_date.astimezone(timezone.utc)
+    except (binascii.Error, ValueError, TypeError, OverflowError):
+        return None
+    return pub_date, pk, 'b' in data
+
+
+class CursorPage:
+    """Страница ленты, полученная по курсору, без COUNT и OFFSET."""
+    by_cursor = True
+
+    def __init__(self, object_list, paginator, cursor, next_cursor,
+                 previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по (pub_date, id): каждая страница -
+    один запрос с LIMIT по индексу, независимо от глубины.
+    """
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def get_page(self, cursor):
+        if not cursor:
+            return self._forward(self.queryset, None)
+        position = decode_cursor(cursor)
+        if position is None:
+            raise Http404('Некорректный курсор ленты')
+        pub_date, pk, backwards = position
+        if backwards:
+            queryset = self.queryset.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            )
+            return self._backward(queryset, cursor)
+        queryset = self.queryset.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+        )
+        return self._forward(queryset, cursor)
+
+    def _forward(self, queryset, cursor):
+        rows = list(
+            queryset.order_by('-pub_date', '-pk')[:self.per_page + 1]
+        )
+        posts = rows[:self.per_page]
+        next_cursor = None
+        if len(rows) > self.per_page:
+            next_cursor = encode_cursor(posts[-1])
+        previous_cursor = None
+        if cursor and posts:
+            previous_cursor = encode_cursor(posts[0], backwards=True)
+        return CursorPage(posts, self, cursor, next_cursor, previous_cursor)
+
+    def _backward(self, queryset, cursor):
+        rows = list(
+            queryset.order_by('pub_date', 'pk')[:self.per_page + 1]
+        )
+        posts = rows[:self.per_page][::-1]
+        previous_cursor = None
+        if len(rows) > self.per_page:
+            previous_cursor = encode_cursor(posts[0], backwards=True)
+        next_cursor = encode_cursor(posts[-1]) if posts else None
+        return CursorPage(posts, self, cursor, next_cursor, previous_cursor)
+
+
+class CountedPaginator(Paginator):
+    """Paginator, который берёт общее число постов у стратегии подсчёта."""
+    def __init__(self, object_list, per_page, count_func, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_func = count_func
+
+    @cached_property
+    def count(self):
+        return self.count_func()
 
 
-def get_paginator(queryset, request):
-    paginator = Paginator(queryset, settings.SHOW_POSTS)
+def get_paginator(queryset, request, scope=None, count=None, cursor=None):
+    if cursor is None:
+        cursor = settings.CURSOR_PAGINATION
+    if cursor:
+        paginator = CursorPaginator(queryset, settings.SHOW_POSTS)
+        return paginator.get_page(request.GET.get('cursor'))
+    if count is None:
+        count_func = get_count_func(queryset, scope)
+    else:
+        def count_func():
+            return count
+    paginator = CountedPaginator(queryset, settings.SHOW_POSTS, count_func)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
@@ -0,0 +1,105 @@
+"""Полнотекстовый поиск по постам.
+
+В SQLite индекс - виртуальная таблица FTS5 с внешним содержимым
+posts_post, которую держат в актуальном виде триггеры (они срабатывают
+и для bulk_create). Без FTS5 поиск идёт через LIKE.
+"""
+import re
+
+from django.db import DatabaseError, connections
+from django.db.models import Q
+
+FTS_TABLE = 'posts_post_fts'
+
+FTS_TRIGGERS = {
+    'posts_post_fts_insert': (
+        'AFTER INSERT ON posts_post BEGIN '
+        'INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); '
+        'END'
+    ),
+    'posts_post_fts_delete': (
+        'AFTER DELETE ON posts_post BEGIN '
+        'INSERT INTO posts_post_fts(posts_post_fts, rowid, text) '
+        "VALUES ('delete', old.id, old.text); "
+        'END'
+    ),
+    'posts_post_fts_update': (
+        'AFTER UPDATE OF text ON posts_post BEGIN '
+        'INSERT INTO posts_post_fts(posts_post_fts, rowid, text) '
+        "VALUES ('delete', old.id, old.text); "
+        'INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); '
+        'END'
+    ),
+}
+
+
+def install_search_index(connection):
+    """Создаёт FTS-таблицу и триггеры, если их нет.
+
+    Вызывается из миграции и после каждого migrate: SQLite пересоздаёт
+    posts_post при изменении схемы, и триггеры теряются.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+    created = FTS_TABLE not in connection.introspection.table_names()
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+                "text, content='posts_post', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+        except DatabaseError:
+            # SQLite собран без FTS5: остаётся поиск через LIKE
+            return False
+        for name, body in FTS_TRIGGERS.items():
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+        if created:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+    return True
+
+
+def uninstall_search_index(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in FTS_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def search_available(using):
+    connection = connections[using]
+    return (
+        connection.vendor == 'sqlite'
+        and FTS_TABLE in connection.introspection.table_names()
+    )
+
+
+def search_terms(query):
+    return re.findall(r'\w+', query or '')[:10]
+
+
+def search_posts(queryset, query):
+    """Посты, содержащие все слова запроса, самые релевантные первыми."""
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if search_available(queryset.db):
+        # Каждое слово в кавычках: пользовательский ввод не разбирается
+        # как синтаксис FTS5, * - поиск по началу слова
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.extra(
+            select={'rank': f'{FTS_TABLE}.rank'},
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = posts_post.id',
+                   f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            order_by=['rank'],
+        )
+    condition = Q()
+    for term in terms:
+        condition &= Q(text__icontains=term)
+    return queryset.filter(condition)
@@ -0,0 +1,194 @@
+from django.db import connections, transaction
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from core.jobs import enqueue
+
+from . import search, timeline
+from .caching import bump_feed_versions, post_scopes
+from .counts import (author_scope, change_counters, group_scope,
+                     shift_author_count, shift_group_count)
+from .details import forget_post
+from .groups import forget_groups
+from .models import Follow, Group, Post, User
+
+# Поля пользователя, из которых шаблоны лент выводят имя автора
+AUTHOR_NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_scopes(sender, instance, raw, **kwargs):
+    """Запоминает группу и автора поста до редактирования."""
+    instance._previous = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list('group_id', 'author_id')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_counters_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        change_counters(['all'], 1)
+        shift_group_count(instance.group_id, 1, instance.pub_date)
+        shift_author_count(instance.author_id, 1)
+        return
+    previous = getattr(instance, '_previous', None)
+    if previous is None:
+        return
+    group_id, author_id = previous
+    if group_id != instance.group_id:
+        shift_group_count(group_id, -1, instance.pub_date)
+        shift_group_count(instance.group_id, 1, instance.pub_date)
+    if author_id != instance.author_id:
+        shift_author_count(author_id, -1)
+        shift_author_count(instance.author_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def update_counters_on_delete(sender, instance, **kwargs):
+    change_counters(['all'], -1)
+    shift_group_count(instance.group_id, -1, instance.pub_date)
+    shift_author_count(instance.author_id, -1)
+
+
+# Кеши сбрасываются после фиксации транзакции: иначе параллельный
+# запрос успел бы закешировать старые строки под новой версией
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_detail(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: forget_post(pk))
+
+
+@receiver(post_save, sender=Post)
+def invalidate_feeds_on_save(sender, instance, raw, **kwargs):
+    scopes = set(post_scopes(instance.group_id, instance.author_id))
+    previous = getattr(instance, '_previous', None)
+    if previous is not None:
+        scopes.update(post_scopes(*previous))
+    transaction.on_commit(lambda: bump_feed_versions(scopes))
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_feeds_on_delete(sender, instance, **kwargs):
+    scopes = post_scopes(instance.group_id, instance.author_id)
+    transaction.on_commit(lambda: bump_feed_versions(scopes))
+
+
+@receiver(pre_save, sender=Group)
+def remember_previous_slug(sender, instance, raw, **kwargs):
+    instance._previous_slug = None
+    if not raw and instance.pk is not None:
+        instance._previous_slug = (
+            Group.objects.filter(pk=instance.pk)
+            .values_list('slug', flat=True).first()
+        )
+
+
+def group_author_scopes(group_id):
+    """Ленты авторов, посты которых ссылаются на группу."""
+    author_ids = (
+        Post.objects.filter(group_id=group_id)
+        .order_by().values_list('author_id', flat=True).distinct()
+    )
+    return [author_scope(author_id) for author_id in author_ids]
+
+
+@receiver(pre_delete, sender=Group)
+def remember_group_authors(sender, instance, **kwargs):
+    # После удаления у постов уже не будет группы
+    instance._author_scopes = group_author_scopes(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_feeds_on_group_change(sender, instance, **kwargs):
+    """Название группы выводится в главной ленте, ссылка по slug -
+    и в лентах авторов.
+    """
+    scopes = ['all', group_scope(instance.pk)]
+    previous_slug = getattr(instance, '_previous_slug', None)
+    author_scopes = getattr(instance, '_author_scopes', None)
+    if author_scopes is None and previous_slug not in (None, instance.slug):
+        author_scopes = group_author_scopes(instance.pk)
+    scopes += author_scopes or []
+    slugs = [instance.slug, previous_slug]
+
+    def invalidate():
+        bump_feed_versions(scopes)
+        forget_groups(slugs)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_name(sender, instance, raw, update_fields, **kwargs):
+    """Запоминает имя автора; вход (update_fields=last_login) пропускаем."""
+    instance._previous_name = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not (
+        set(update_fields) & set(AUTHOR_NAME_FIELDS)
+    ):
+        return
+    instance._previous_name = (
+        User.objects.filter(pk=instance.pk)
+        .values_list(*AUTHOR_NAME_FIELDS).first()
+    )
+
+
+def author_feed_scopes(author_id):
+    """Ленты, в которых выводится имя автора: главная, его и его групп."""
+    group_ids = (
+        Post.objects.filter(author_id=author_id, group__isnull=False)
+        .order_by().values_list('group_id', flat=True).distinct()
+    )
+    return ['all', author_scope(author_id)] + [
+        group_scope(group_id) for group_id in group_ids
+    ]
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feeds(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_name', None)
+    if created or previous is None:
+        return
+    current = tuple(getattr(instance, field) for field in AUTHOR_NAME_FIELDS)
+    if previous != current:
+        scopes = author_feed_scopes(instance.pk)
+        transaction.on_commit(lambda: bump_feed_versions(scopes))
+
+
+@receiver(post_save, sender=Post)
+def fan_out_to_followers(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        enqueue('posts.fan_out_post', post_id=instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def fill_follower_timeline(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        timeline.shift_follower_count(instance.author_id, 1)
+        timeline.backfill(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def clear_follower_timeline(sender, instance, **kwargs):
+    timeline.shift_follower_count(instance.author_id, -1)
+    timeline.remove_author(instance.user_id, instance.author_id)
+    if timeline.fanout_resumed(instance.author_id):
+        enqueue('posts.backfill_followers', author_id=instance.author_id)
+
+
+def restore_search_index(sender, using, **kwargs):
+    """Возвращает триггеры поиска, если migrate пересоздал posts_post."""
+    connection = connections[using]
+    if 'posts_post' in connection.introspection.table_names():
+        search.install_search_index(connection)
@@ -0,0 +1,30 @@
+"""Фоновые задачи, которые ставят сигналы постов и подписок: раздача
+постов по лентам подписчиков.
+"""
+from core.jobs import task
+
+from . import timeline
+from .models import Post
+
+
+@task('posts.fan_out_post')
+def fan_out_post_task(post_id):
+    post = Post.objects.filter(pk=post_id).only(
+        'author_id', 'pub_date'
+    ).first()
+    if post is not None:
+        timeline.fan_out_post(post)
+
+
+@task('posts.fan_out_posts')
+def fan_out_posts_task(post_ids):
+    """Раздача пакета постов одного автора из пакетного API."""
+    posts = list(
+        Post.objects.filter(pk__in=post_ids).only('author_id', 'pub_date')
+    )
+    timeline.fan_out_posts(posts)
+
+
+@task('posts.backfill_followers')
+def backfill_followers_task(author_id):
+    timeline.backfill_followers(author_id)
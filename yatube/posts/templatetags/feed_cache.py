@@ -0,0 +1,36 @@
+from django import template
+
+from ..caching import cached_fragment
+
+register = template.Library()
+
+
+class FeedCacheNode(template.Node):
+    def __init__(self, nodelist, scope, page_obj):
+        self.nodelist = nodelist
+        self.scope = scope
+        self.page_obj = page_obj
+
+    def render(self, context):
+        return cached_fragment(
+            self.scope.resolve(context),
+            self.page_obj.resolve(context),
+            lambda: self.nodelist.render(context),
+        )
+
+
+@register.tag
+def feedcache(parser, token):
+    """Кеширует фрагмент ленты: {% feedcache scope page_obj %}."""
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' принимает область ленты и page_obj"
+        )
+    nodelist = parser.parse(('endfeedcache',))
+    parser.delete_first_token()
+    return FeedCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2]),
+    )
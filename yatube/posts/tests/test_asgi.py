@@ -0,0 +1,89 @@
+from asgiref.sync import async_to_sync
+from channels.testing import HttpCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.test import TransactionTestCase, override_settings
+from django.urls import path
+
+from core.benchmarks.servers import asgi_scope
+from yatube.routing import application
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+SENT = []
+
+
+def stream(request):
+    def content():
+        yield b'first'
+        # Первая часть уже у клиента, пока итератор не дочитан
+        bodies = [message.get('body') for message in SENT]
+        yield b'streamed' if b'first' in bodies else b'buffered'
+
+    return StreamingHttpResponse(content())
+
+
+urlpatterns = [path('stream/', stream)]
+
+
+class AsgiFeedTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Test_username')
+        self.group = Group.objects.create(title='test_group', slug='test_slug')
+        self.post = Post.objects.create(
+            text='test_text', author=self.author, group=self.group
+        )
+
+    def get(self, path, *headers):
+        communicator = HttpCommunicator(
+            application, 'GET', path,
+            headers=[(b'host', b'testserver'), *headers],
+        )
+        return async_to_sync(communicator.get_response)(timeout=10)
+
+    def test_feed_pages(self):
+        urls = (
+            '/',
+            '/group/test_slug/',
+            '/profile/Test_username/',
+            f'/posts/{self.post.pk}/',
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.get(url)
+                self.assertEqual(response['status'], 200)
+                self.assertIn('test_text', response['body'].decode())
+
+    def test_not_found_and_other_pages(self):
+        self.assertEqual(self.get('/group/missing/')['status'], 404)
+        self.assertEqual(self.get('/about/author/')['status'], 200)
+
+    def test_middleware_applied(self):
+        """Под ASGI запрос проходит те же middleware, что и под WSGI."""
+        response = self.get('/')
+        headers = dict(response['headers'])
+        self.assertEqual(headers[b'X-Frame-Options'], b'SAMEORIGIN')
+        self.assertIn(b'ETag', headers)
+        response = self.get('/', (b'if-none-match', headers[b'ETag']))
+        self.assertEqual(response['status'], 304)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_streaming_response_not_buffered(self):
+        SENT.clear()
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            SENT.append(message)
+
+        async def run():
+            await application(asgi_scope('/stream/'))(receive, send)
+
+        async_to_sync(run)()
+        body = b''.join(message.get('body', b'') for message in SENT)
+        self.assertEqual(body, b'firststreamed')
@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.benchmarks.measure import measure, percentile
+from core.benchmarks.scenarios import SCENARIOS, Dataset, make_call
+from core.benchmarks.seed import seed
+
+from ..models import Group, Post, User
+
+
+class BenchmarkSuiteTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_seed_volumes(self):
+        """Сидер создаёт заданное число постов, авторов и групп."""
+        seed(posts=50, authors=5, groups=3, batch_size=20)
+        self.assertEqual(Post.objects.count(), 50)
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(
+            sum(Group.objects.values_list('post_count', flat=True)),
+            Post.objects.exclude(group=None).count(),
+        )
+
+    def test_scenarios_measure(self):
+        """Каждый сценарий отвечает без ошибок и даёт метрики."""
+        seed(posts=30, authors=3, groups=2)
+        data = Dataset()
+        for name in SCENARIOS:
+            with self.subTest(scenario=name):
+                result = measure(make_call(name, data), 3, memory_samples=1)
+                self.assertEqual(result['requests'], 3)
+                self.assertGreater(result['queries_per_request'], 0)
+                self.assertGreater(result['peak_memory_kb'], 0)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
@@ -0,0 +1,121 @@
+import base64
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Follow, Group, Post, TimelineEntry, User
+from .utils import run_on_commit
+
+
+def basic_auth(username, password):
+    credentials = base64.b64encode(f'{username}:{password}'.encode())
+    return {'HTTP_AUTHORIZATION': 'Basic ' + credentials.decode()}
+
+
+class PostBulkCreateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='author', password='secret'
+        )
+        cls.follower = User.objects.create_user(username='follower')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:post_bulk_create')
+        self.auth = basic_auth('author', 'secret')
+
+    def send(self, data, **headers):
+        return self.client.post(
+            self.url, json.dumps(data), content_type='application/json',
+            **headers
+        )
+
+    def test_credentials_required(self):
+        response = self.send([{'text': 'Пост'}])
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Basic', response['WWW-Authenticate'])
+        response = self.send(
+            [{'text': 'Пост'}], **basic_auth('author', 'wrong')
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Post.objects.exists())
+
+    def test_creates_batch_in_order(self):
+        response = self.send([
+            {'text': 'Первый', 'group': self.group.pk},
+            {'text': 'Второй\nпост'},
+        ], **self.auth)
+        self.assertEqual(response.status_code, 201)
+        ids = response.json()['ids']
+        posts = [Post.objects.get(pk=pk) for pk in ids]
+        self.assertEqual(
+            [(post.text, post.group) for post in posts],
+            [('Первый', self.group), ('Второй\nпост', None)],
+        )
+        self.assertTrue(all(post.author == self.author for post in posts))
+        self.assertIn('Второй<br>пост', posts[1].text_html)
+
+    def test_side_effects_of_signals(self):
+        """Счётчики, ленты подписчиков и кеш лент - как у одиночного поста."""
+        Follow.objects.create(user=self.follower, author=self.author)
+        self.client.get(reverse('posts:main_page'))
+        with run_on_commit():
+            self.send({'posts': [
+                {'text': 'Пост в группе', 'group': self.group.pk},
+                {'text': 'Пост без группы'},
+            ]}, **self.auth)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 1)
+        self.author.profile.refresh_from_db()
+        self.assertEqual(self.author.profile.post_count, 2)
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.follower).count(), 2
+        )
+        self.assertContains(
+            self.client.get(reverse('posts:main_page')), 'Пост без группы'
+        )
+
+    def test_invalid_item_rejects_whole_batch(self):
+        response = self.send([
+            {'text': 'Верный пост'},
+            {'text': '   '},
+            {'text': 'Чужая группа', 'group': 999},
+        ], **self.auth)
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual(set(errors), {'1', '2'})
+        self.assertIn('text', errors['1'])
+        self.assertIn('group', errors['2'])
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(POSTS_BULK_LIMIT=2)
+    def test_malformed_requests(self):
+        for body in ('не json', '[]', '{"posts": 1}', '["текст"]',
+                     json.dumps([{'text': 'Пост'}] * 3)):
+            with self.subTest(body=body):
+                response = self.client.post(
+                    self.url, body, content_type='application/json',
+                    **self.auth
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    @override_settings(JOBS_EAGER=False)
+    def test_queries_do_not_grow_with_batch(self):
+        def count(size):
+            with CaptureQueriesContext(connection) as queries:
+                self.send(
+                    [{'text': 'Пост', 'group': self.group.pk}] * size,
+                    **self.auth
+                )
+            return len(queries)
+
+        self.assertEqual(count(2), count(20))
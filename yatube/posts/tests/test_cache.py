@@ -0,0 +1,282 @@
+import warnings
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from .. import caching
+from ..models import Group, Post
+from ..paginator import CursorPage
+from .utils import run_on_commit
+
+User = get_user_model()
+
+
+class FeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test_description',
+        )
+        cls.other_group = Group.objects.create(
+            title='other_group',
+            slug='other_slug',
+            description='test_description',
+        )
+        cls.author = User.objects.create_user(username='Test_username')
+        cls.post = Post.objects.create(
+            text='test_text', author=cls.author, group=cls.group
+        )
+        Post.objects.create(
+            text='other_text', author=cls.author, group=cls.other_group
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def post_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        selects = [
+            query for query in queries
+            if '"posts_post"."text_html"' in query['sql']
+        ]
+        return response, len(selects)
+
+    def test_repeated_page_served_from_cache(self):
+        """Повторный показ страницы ленты не читает посты из базы."""
+        urls = (
+            reverse('posts:main_page'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                first, first_selects = self.post_queries(url)
+                second, second_selects = self.post_queries(url)
+                self.assertEqual(first_selects, 1)
+                self.assertEqual(second_selects, 0)
+                self.assertContains(second, 'test_text')
+        self.assertEqual(
+            caching.stats(), {'hits': 3, 'misses': 3, 'hit_ratio': 0.5}
+        )
+
+    def test_edit_invalidates_only_affected_feeds(self):
+        """Правка поста сбрасывает ленты его группы, автора и главную,
+        но не трогает ленты других групп.
+        """
+        group_url = reverse('posts:group_list', args=(self.group.slug,))
+        other_url = reverse('posts:group_list', args=(self.other_group.slug,))
+        main_url = reverse('posts:main_page')
+        for url in (group_url, other_url, main_url):
+            self.client.get(url)
+        self.post.text = 'edited_text'
+        with run_on_commit():
+            self.post.save()
+        response, selects = self.post_queries(group_url)
+        self.assertEqual(selects, 1)
+        self.assertContains(response, 'edited_text')
+        response, selects = self.post_queries(main_url)
+        self.assertEqual(selects, 1)
+        response, selects = self.post_queries(other_url)
+        self.assertEqual(selects, 0)
+
+    def test_moved_post_leaves_previous_group_feed(self):
+        """Пост, перенесённый в другую группу, пропадает из старой ленты."""
+        group_url = reverse('posts:group_list', args=(self.group.slug,))
+        self.client.get(group_url)
+        self.post.group = self.other_group
+        with run_on_commit():
+            self.post.save()
+        self.assertNotContains(self.client.get(group_url), 'test_text')
+
+    def test_author_rename_invalidates_feeds_with_author(self):
+        """Новое имя автора видно в главной ленте, его группах и профиле."""
+        urls = (
+            reverse('posts:main_page'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+        )
+        for url in urls:
+            self.client.get(url)
+        author = User.objects.get(pk=self.author.pk)
+        author.first_name = 'Новое'
+        author.last_name = 'Имя'
+        with run_on_commit():
+            author.save()
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), 'Новое Имя')
+
+    def test_group_slug_change_invalidates_author_feed(self):
+        """Ссылка на группу в ленте автора ведёт на новый slug."""
+        url = reverse('posts:profile', args=(self.author.username,))
+        self.client.get(url)
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'renamed_slug'
+        with run_on_commit():
+            group.save()
+        self.assertContains(
+            self.client.get(url),
+            reverse('posts:group_list', args=('renamed_slug',)),
+        )
+        with run_on_commit():
+            group.delete()
+        self.assertNotContains(
+            self.client.get(url),
+            reverse('posts:group_list', args=('renamed_slug',)),
+        )
+
+    def test_cursor_hashed_in_fragment_key(self):
+        """Длинный курсор клиента не попадает в ключ кеша как есть."""
+        page_obj = CursorPage([], None, 'c' * 300, None, None)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            caching.cached_fragment('all', page_obj, lambda: 'html')
+            self.assertEqual(
+                caching.cached_fragment('all', page_obj, lambda: 'new'),
+                'html',
+            )
+
+    def test_login_keeps_feeds(self):
+        """Вход меняет только last_login: ленты не сбрасываются."""
+        version = caching.feed_version('all')
+        self.author.set_password('password')
+        self.author.save()
+        self.client.login(username=self.author.username, password='password')
+        self.assertEqual(caching.feed_version('all'), version)
+
+    def test_stats_available_to_staff_only(self):
+        """Статистика кеша доступна только персоналу."""
+        url = reverse('posts:feed_cache_stats')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(
+            self.client.get(url).json(),
+            {'hits': 0, 'misses': 0, 'hit_ratio': 0.0},
+        )
+
+
+class InvalidationOnCommitTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Test_username')
+
+    def test_feeds_invalidated_after_commit(self):
+        """Пока транзакция не зафиксирована, версия ленты прежняя."""
+        version = caching.feed_version('all')
+        with transaction.atomic():
+            Post.objects.create(text='test_text', author=self.author)
+            self.assertEqual(caching.feed_version('all'), version)
+        self.assertNotEqual(caching.feed_version('all'), version)
+
+    def test_rollback_keeps_feeds(self):
+        version = caching.feed_version('all')
+        with self.assertRaises(ValueError), transaction.atomic():
+            Post.objects.create(text='test_text', author=self.author)
+            raise ValueError
+        self.assertEqual(caching.feed_version('all'), version)
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test_description',
+        )
+        cls.author = User.objects.create_user(username='Test_username')
+        cls.post = Post.objects.create(
+            text='test_text', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.urls = (
+            reverse('posts:main_page'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
+
+    def test_matching_etag_returns_304(self):
+        """Повторный запрос с ETag получает 304, после правки - 200."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        self.post.text = 'edited_text'
+        with run_on_commit():
+            self.post.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'edited_text')
+
+    def test_last_modified_for_anonymous_only(self):
+        """Last-Modified отдаётся только анонимным посетителям."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                last_modified = self.client.get(url)['Last-Modified']
+                response = self.client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=last_modified
+                )
+                self.assertEqual(response.status_code, 304)
+        self.client.force_login(self.author)
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertFalse(self.client.get(url).has_header(
+                    'Last-Modified'
+                ))
+
+    def test_detail_revalidated_after_rename(self):
+        """Страница поста выводит имя автора и группу: их смена - 200."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        for obj, field in ((self.author, 'first_name'), (self.group, 'title')):
+            with self.subTest(field=field):
+                etag = self.client.get(url)['ETag']
+                setattr(obj, field, 'Переименован')
+                with run_on_commit():
+                    obj.save()
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Переименован')
+
+    def test_detail_last_modified_follows_rename(self):
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        last_modified = self.client.get(url)['Last-Modified']
+        later = timezone.now() + timedelta(hours=1)
+        with mock.patch.object(caching.timezone, 'now', return_value=later):
+            self.author.first_name = 'Переименован'
+            with run_on_commit():
+                self.author.save()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Last-Modified'], http_date(later.timestamp())
+        )
+
+    def test_etag_depends_on_user(self):
+        """ETag страницы различается для гостя и пользователя."""
+        url = reverse('posts:main_page')
+        etag = self.client.get(url)['ETag']
+        self.client.force_login(self.author)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,188 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+from .test_settings import load_prod_settings
+
+User = get_user_model()
+
+
+class RecountPostsCommandTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test_description',
+        )
+        cls.author = User.objects.create_user(username='Test_username')
+
+    def test_recount_posts(self):
+        """recount_posts восстанавливает счётчики после bulk_create."""
+        Post.objects.bulk_create(
+            Post(text=f'test_text_{i}', author=self.author, group=self.group)
+            for i in range(3)
+        )
+        self.author.profile.delete()
+        call_command('recount_posts', stdout=StringIO())
+        self.group.refresh_from_db()
+        self.author.refresh_from_db()
+        self.assertEqual(self.group.post_count, 3)
+        self.assertEqual(self.author.profile.post_count, 3)
+
+
+class ImportPostsCommandTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test_description',
+        )
+        cls.author = User.objects.create_user(username='Test_username')
+
+    def import_file(self, suffix, content, *args):
+        with tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, delete=False, encoding='utf-8'
+        ) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        out = StringIO()
+        call_command('import_posts', file.name, *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_jsonl(self):
+        """JSONL загружается пачками, неизвестные авторы пропускаются."""
+        rows = [
+            {'text': f'text_{i}', 'author': 'Test_username',
+             'group': 'test_slug', 'pub_date': f'2020-01-0{i + 1}T10:00:00'}
+            for i in range(5)
+        ]
+        rows.append({'text': 'lost', 'author': 'nobody'})
+        output = self.import_file(
+            '.jsonl',
+            '\n'.join(json.dumps(row) for row in rows),
+            '--batch-size', '2',
+        )
+        self.assertIn('Загружено 5, пропущено 1', output)
+        post = Post.objects.get(text='text_0')
+        self.assertEqual(post.group, self.group)
+        self.assertEqual(post.pub_date.year, 2020)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 5)
+
+    def test_malformed_jsonl_rows_skipped(self):
+        """Битый JSON и строки не того вида пропускаются."""
+        lines = [
+            '{"text": "good", "author": "Test_username"}',
+            '{"text": "broken", ',
+            '["not", "an", "object"]',
+            '{"text": "bad author", "author": ["Test_username"]}',
+            '{"text": "bad date", "author": "Test_username", "pub_date": 1}',
+        ]
+        output = self.import_file('.jsonl', '\n'.join(lines))
+        self.assertIn('Загружено 1, пропущено 4', output)
+        self.assertTrue(Post.objects.filter(text='good').exists())
+
+    def test_import_csv(self):
+        """CSV без группы и даты тоже загружается."""
+        output = self.import_file(
+            '.csv', 'text,author,group\ncsv_text,Test_username,\n'
+        )
+        self.assertIn('Загружено 1, пропущено 0', output)
+        post = Post.objects.get(text='csv_text')
+        self.assertIsNone(post.group)
+        self.assertEqual(post.author, self.author)
+
+
+class ExportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test_description',
+        )
+        cls.author = User.objects.create_user(username='Test_username')
+        Post.objects.create(
+            text='текст, с запятой', author=cls.author, group=cls.group
+        )
+        Post.objects.create(text='без группы', author=cls.author)
+
+    def test_export_jsonl(self):
+        """export_posts выгружает посты с автором и группой."""
+        out = StringIO()
+        call_command('export_posts', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [(row['text'], row['author'], row['group']) for row in rows],
+            [('текст, с запятой', 'Test_username', 'test_slug'),
+             ('без группы', 'Test_username', '')],
+        )
+
+    def test_export_csv_file(self):
+        """CSV-выгрузка в файл читается обратно командой import_posts."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'posts.csv')
+            call_command('export_posts', '--format', 'csv', '--output', path)
+            Post.objects.all().delete()
+            call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(
+            set(Post.objects.values_list('text', 'group__slug')),
+            {('текст, с запятой', 'test_slug'), ('без группы', None)},
+        )
+
+    def test_admin_export_streams_for_staff_only(self):
+        """Выгрузка из админки доступна только персоналу и идёт потоком."""
+        url = reverse('admin:posts_post_export') + '?format=csv'
+        self.client.force_login(self.author)
+        self.assertEqual(self.client.get(url).status_code, 302)
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin)
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        self.assertTrue(content.startswith('id,text,author,group,pub_date'))
+        self.assertIn('"текст, с запятой",Test_username,test_slug', content)
+
+
+class WarmTemplatesCommandTest(TestCase):
+    @override_settings(TEMPLATES=load_prod_settings().TEMPLATES)
+    def test_warm_templates_fills_cached_loader(self):
+        """warm_templates компилирует шаблоны в кеш загрузчика."""
+        out = StringIO()
+        call_command('warm_templates', stdout=out)
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIn('posts/index.html', loader.get_template_cache)
+        self.assertIn('includes/post_text.html', loader.get_template_cache)
+        self.assertIn('Скомпилировано шаблонов', out.getvalue())
+
+
+class RenderPostTextCommandTest(TestCase):
+    def test_backfill_empty_html(self):
+        """render_post_text заполняет HTML постов, созданных до миграции."""
+        author = User.objects.create_user(username='Test_username')
+        for number in range(3):
+            Post.objects.create(text=f'строка\n{number}', author=author)
+        Post.objects.update(text_html='', excerpt='')
+        call_command(
+            'render_post_text', '--batch-size', '2', stdout=StringIO()
+        )
+        self.assertEqual(
+            sorted(Post.objects.values_list('text_html', 'excerpt')),
+            [(f'строка<br>{number}', f'строка\n{number}')
+             for number in range(3)],
+        )
@@ -0,0 +1,115 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core import compression
+from core.views import serve_static
+
+from ..models import Post, User
+
+
+@mock.patch.object(compression, 'brotli', None)
+class CompressionMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(username='author')
+        Post.objects.bulk_create(
+            Post(text=f'Тестовый пост {i}', author=author) for i in range(10)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_html_gzip(self):
+        """HTML сжимается gzip, если клиент его принимает."""
+        plain = self.client.get(reverse('posts:main_page'))
+        response = self.client.get(
+            reverse('posts:main_page'), HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+    def test_not_accepted(self):
+        """Без Accept-Encoding или с q=0 ответ не сжимается."""
+        for header in ('', 'gzip;q=0', 'identity'):
+            with self.subTest(header=header):
+                response = self.client.get(
+                    reverse('posts:main_page'), HTTP_ACCEPT_ENCODING=header
+                )
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_choose_encoding(self):
+        self.assertEqual(compression.choose_encoding('*'), 'gzip')
+        self.assertEqual(compression.choose_encoding('br, gzip'), 'gzip')
+        with mock.patch.object(compression, 'brotli', mock.Mock()):
+            self.assertEqual(compression.choose_encoding('gzip, br'), 'br')
+            self.assertEqual(
+                compression.choose_encoding('gzip, br;q=0'), 'gzip'
+            )
+        self.assertIsNone(compression.choose_encoding('deflate'))
+
+
+@mock.patch.object(compression, 'brotli', None)
+class CompressedStaticTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'
+            ),
+        )
+        cls.settings.enable()
+        with mock.patch.object(compression, 'brotli', None):
+            call_command('collectstatic', interactive=False, verbosity=0)
+        cls.css = staticfiles_storage.stored_name('css/bootstrap.min.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def get(self, path, accept_encoding=''):
+        request = RequestFactory().get(
+            '/static/' + path, HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        response = serve_static(request, path)
+        return response, b''.join(response.streaming_content)
+
+    def test_precompressed_copy(self):
+        """Рядом с хешированным CSS лежит его сжатая копия."""
+        self.assertNotEqual(self.css, 'css/bootstrap.min.css')
+        with open(os.path.join(self.static_root, self.css), 'rb') as file:
+            original = file.read()
+        path = os.path.join(self.static_root, self.css + '.gz')
+        with open(path, 'rb') as file:
+            self.assertEqual(gzip.decompress(file.read()), original)
+
+    def test_serve_hashed(self):
+        """Хешированный файл отдаётся сжатым и кешируется надолго."""
+        plain, plain_body = self.get(self.css)
+        response, body = self.get(self.css, 'gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(gzip.decompress(body), plain_body)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+
+    def test_serve_unhashed(self):
+        """Файл без хеша в имени может измениться: без долгого кеша."""
+        response, _ = self.get('css/bootstrap.min.css')
+        self.assertFalse(response.has_header('Cache-Control'))
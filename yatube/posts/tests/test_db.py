@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import db
+
+from ..models import Post
+
+User = get_user_model()
+
+
+class SqliteSettingsTest(TestCase):
+    def test_pragmas(self):
+        """Соединение получает PRAGMA из SQLITE_PRAGMAS."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -64 * 1024)
+
+
+class ReadReplicaRouterTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Test_username')
+        Post.objects.create(text='test_text', author=cls.author)
+
+    def test_no_replica_configured(self):
+        """Без описанного alias чтение идёт через default."""
+        self.assertNotIn('replica', connections.databases)
+        db._state.reading = True
+        try:
+            self.assertIsNone(db.read_alias())
+        finally:
+            db._state.reading = False
+
+    @override_settings(DATABASE_READ_ALIAS='default')
+    def test_marked_views_read_from_alias(self):
+        """Помеченные view читают через alias, остальные - нет."""
+        seen = []
+
+        def spy(execute, sql, params, many, context):
+            seen.append(db.read_alias())
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(spy):
+            self.client.get(reverse('posts:main_page'))
+        self.assertTrue(seen)
+        self.assertEqual(set(seen), {'default'})
+        self.assertIsNone(db.read_alias())
+        seen.clear()
+        with connection.execute_wrapper(spy):
+            self.client.get(
+                reverse('posts:post_detail', args=(Post.objects.get().pk,))
+            )
+        self.assertEqual(set(seen), {None})
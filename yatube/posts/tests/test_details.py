@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import Http404
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import details
+from ..models import Group, Post, User
+from .utils import run_on_commit
+
+
+class PostDetailCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            text='Текст поста', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:post_detail', args=(self.post.pk,))
+
+    def expire(self):
+        key = details.DETAIL_KEY.format(self.post.pk)
+        entry = cache.get(key)
+        entry['expires'] = 0
+        cache.set(key, entry)
+
+    def test_hydrated_post_cached(self):
+        """Пост, автор, профиль и группа - один запрос, потом из кеша."""
+        with self.assertNumQueries(1):
+            details.get_post(self.post.pk)
+        with self.assertNumQueries(0):
+            post = details.get_post(self.post.pk)
+            self.assertEqual(post.author.profile.post_count, 1)
+            self.assertEqual(post.group.title, 'Группа')
+
+    def test_page_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Текст поста')
+
+    def test_edit_and_delete_invalidate(self):
+        details.get_post(self.post.pk)
+        self.client.force_login(self.author)
+        with run_on_commit():
+            self.client.post(
+                reverse('posts:post_edit', args=(self.post.pk,)),
+                {'text': 'Новый текст', 'group': self.group.pk},
+            )
+        self.assertContains(self.client.get(self.url), 'Новый текст')
+        with run_on_commit():
+            Post.objects.get(pk=self.post.pk).delete()
+        with self.assertRaises(Http404):
+            details.get_post(self.post.pk)
+
+    def test_related_changes_invalidate(self):
+        """Имя автора, число его постов и название группы не устаревают."""
+        details.get_post(self.post.pk)
+        self.author.first_name = 'Автор'
+        with run_on_commit():
+            self.author.save()
+        self.assertEqual(
+            details.get_post(self.post.pk).author.first_name, 'Автор'
+        )
+        with run_on_commit():
+            Post.objects.create(text='Ещё пост', author=self.author)
+        post = details.get_post(self.post.pk)
+        self.assertEqual(post.author.profile.post_count, 2)
+        self.group.title = 'Переименована'
+        with run_on_commit():
+            self.group.save()
+        self.assertEqual(
+            details.get_post(self.post.pk).group.title, 'Переименована'
+        )
+
+    def test_stale_served_while_other_request_refreshes(self):
+        details.get_post(self.post.pk)
+        self.expire()
+        cache.add(details.LOCK_KEY.format(self.post.pk), 'other')
+        with self.assertNumQueries(0):
+            details.get_post(self.post.pk)
+        cache.delete(details.LOCK_KEY.format(self.post.pk))
+        with self.assertNumQueries(1):
+            details.get_post(self.post.pk)
+        with self.assertNumQueries(0):
+            details.get_post(self.post.pk)
+
+    def test_miss_waits_for_other_request(self):
+        """Без записи в кеше запрос ждёт пересчёт, а не идёт в базу."""
+        cache.add(details.LOCK_KEY.format(self.post.pk), 'other')
+
+        def other_request_finishes(seconds):
+            details.refresh(self.post.pk)
+
+        with mock.patch.object(details.time, 'sleep',
+                               side_effect=other_request_finishes) as sleep:
+            # Единственный запрос - пересчёт "другим" запросом
+            with self.assertNumQueries(1):
+                post = details.get_post(self.post.pk)
+        self.assertEqual(post, self.post)
+        self.assertEqual(sleep.call_count, 1)
+
+    def test_miss_loads_itself_when_refresh_gives_up(self):
+        lock = details.LOCK_KEY.format(self.post.pk)
+        cache.add(lock, 'other')
+        with mock.patch.object(details.time, 'sleep',
+                               side_effect=lambda s: cache.delete(lock)):
+            self.assertEqual(details.get_post(self.post.pk), self.post)
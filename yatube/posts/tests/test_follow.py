@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Follow, Post, TimelineEntry
+from ..timeline import TimelineFeed
+from .utils import run_on_commit
+
+User = get_user_model()
+
+
+class FollowTimelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.old_post = Post.objects.create(text='old_post', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.reader)
+
+    def follow(self):
+        return self.client.get(
+            reverse('posts:profile_follow', args=(self.author.username,))
+        )
+
+    def test_follow_and_unfollow(self):
+        """Подписка заполняет ленту прошлыми постами, отписка очищает."""
+        self.assertRedirects(
+            self.follow(),
+            reverse('posts:profile', args=(self.author.username,))
+        )
+        self.assertTrue(
+            Follow.objects.filter(user=self.reader, author=self.author)
+            .exists()
+        )
+        self.author.profile.refresh_from_db()
+        self.assertEqual(self.author.profile.follower_count, 1)
+        self.assertEqual(
+            list(TimelineEntry.objects.filter(user=self.reader)
+                 .values_list('post_id', flat=True)),
+            [self.old_post.pk],
+        )
+        self.client.get(
+            reverse('posts:profile_unfollow', args=(self.author.username,))
+        )
+        self.assertFalse(Follow.objects.exists())
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.author.profile.refresh_from_db()
+        self.assertEqual(self.author.profile.follower_count, 0)
+
+    def test_self_follow_ignored(self):
+        self.client.get(
+            reverse('posts:profile_follow', args=(self.reader.username,))
+        )
+        self.assertFalse(Follow.objects.exists())
+
+    def test_new_post_fans_out_to_followers(self):
+        """Новый пост попадает в ленту подписчика и только его."""
+        self.follow()
+        with run_on_commit():
+            post = Post.objects.create(text='new_post', author=self.author)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            list(response.context['page_obj']), [post, self.old_post]
+        )
+        self.client.force_login(self.stranger)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(len(response.context['page_obj']), 0)
+
+    def test_celebrity_posts_merged_on_read(self):
+        """Посты популярного автора не раздаются, а подмешиваются."""
+        other = User.objects.create_user(username='other')
+        Follow.objects.create(user=self.reader, author=other)
+        other_post = Post.objects.create(text='other_post', author=other)
+        self.follow()
+        with override_settings(TIMELINE_FANOUT_LIMIT=0):
+            post = Post.objects.create(text='new_post', author=self.author)
+            self.assertFalse(
+                TimelineEntry.objects.filter(post=post).exists()
+            )
+            feed = TimelineFeed(self.reader)
+            self.assertEqual(feed.count(), 3)
+            self.assertEqual(feed[0:3], [post, other_post, self.old_post])
+            self.assertEqual(feed[1:2], [other_post])
+
+    def test_celebrity_posts_fanned_out_below_limit(self):
+        """Посты времён популярности раздаются, когда подписчиков
+        снова не больше предела.
+        """
+        self.follow()
+        Follow.objects.create(user=self.stranger, author=self.author)
+        with override_settings(TIMELINE_FANOUT_LIMIT=1):
+            post = Post.objects.create(text='new_post', author=self.author)
+            self.assertFalse(
+                TimelineEntry.objects.filter(post=post).exists()
+            )
+            with run_on_commit():
+                Follow.objects.get(user=self.stranger).delete()
+            feed = TimelineFeed(self.reader)
+            self.assertEqual(feed.count(), 2)
+            self.assertEqual(feed[0:2], [post, self.old_post])
+
+    def test_follow_changes_profile_etag(self):
+        """После подписки профиль не отдаёт 304 со старой кнопкой."""
+        url = reverse('posts:profile', args=(self.author.username,))
+        etag = self.client.get(url)['ETag']
+        self.follow()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['following'])
+
+    @override_settings(SHOW_POSTS=2)
+    def test_follow_page_queries(self):
+        """Страница ленты подписок не зависит от числа подписок."""
+        self.follow()
+        with run_on_commit():
+            for number in range(5):
+                Post.objects.create(
+                    text=f'post_{number}', author=self.author
+                )
+        url = reverse('posts:follow_index')
+        self.client.get(url)
+        # Сессия и пользователь из кеша;
+        # популярные авторы, COUNT, страница, посты
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {'page': 2})
+        self.assertEqual(len(response.context['page_obj']), 2)
+
+    def test_timeline_page_uses_index(self):
+        feed = TimelineFeed(self.reader)
+        plan = (
+            feed.entries().order_by('-pub_date', '-post_id')
+            .values_list('pub_date', 'post_id')[:10].explain()
+        )
+        self.assertIn('timeline_feed_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
@@ -94,3 +94,33 @@ class UserFormCreateTest(TestCase):
             'posts:post_detail', args={post_1.id})
                              )
         self.assertEqual(Post.objects.get(id=post_1.id).text, 'new_text_post')
+        self.assertEqual(
+            Post.objects.get(id=post_1.id).text_html, 'new_text_post'
+        )
+
+    def test_post_counts_follow_form_changes(self):
+        """Создание и перенос поста в другую группу
+        обновляют счётчики постов автора и групп.
+        """
+        group_2 = Group.objects.create(
+            title='test_group_2',
+            slug='test_slug_2',
+            description='test_description_2',
+        )
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'new_post', 'group': self.group.id},
+        )
+        post = Post.objects.latest('pk')
+        self.group.refresh_from_db()
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.group.post_count, 2)
+        self.assertEqual(self.user.profile.post_count, 2)
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=(post.id,)),
+            data={'text': 'new_post', 'group': group_2.id},
+        )
+        self.group.refresh_from_db()
+        group_2.refresh_from_db()
+        self.assertEqual(self.group.post_count, 1)
+        self.assertEqual(group_2.post_count, 1)
@@ -0,0 +1,141 @@
+import warnings
+
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.http import Http404
+from django.test import TestCase
+from django.urls import reverse
+
+from ..counts import recount_post_counts
+from ..groups import get_group
+from ..models import Group, Post, User
+from .utils import run_on_commit
+
+
+class GroupDirectoryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Бета', slug='beta', description='Описание беты'
+        )
+        cls.empty_group = Group.objects.create(
+            title='Альфа', slug='alpha', description='Пустая группа'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_summary_refreshed_on_post_writes(self):
+        """post_count и last_post_date группы следуют за постами."""
+        first = Post.objects.create(
+            text='Первый', author=self.author, group=self.group
+        )
+        second = Post.objects.create(
+            text='Второй', author=self.author, group=self.group
+        )
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 2)
+        self.assertEqual(self.group.last_post_date, second.pub_date)
+        second.delete()
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 1)
+        self.assertEqual(self.group.last_post_date, first.pub_date)
+
+    def test_summary_follows_moved_post(self):
+        first = Post.objects.create(
+            text='Первый', author=self.author, group=self.group
+        )
+        second = Post.objects.create(
+            text='Второй', author=self.author, group=self.group
+        )
+        second.group = self.empty_group
+        second.save()
+        self.group.refresh_from_db()
+        self.empty_group.refresh_from_db()
+        self.assertEqual(
+            (self.group.post_count, self.group.last_post_date),
+            (1, first.pub_date),
+        )
+        self.assertEqual(
+            (self.empty_group.post_count, self.empty_group.last_post_date),
+            (1, second.pub_date),
+        )
+
+    def test_recount_fills_last_post_date(self):
+        Post.objects.bulk_create([
+            Post(text='Импорт', author=self.author, group=self.group),
+        ])
+        recount_post_counts()
+        self.group.refresh_from_db()
+        self.assertEqual(
+            self.group.last_post_date, self.group.posts.get().pub_date
+        )
+        self.empty_group.refresh_from_db()
+        self.assertIsNone(self.empty_group.last_post_date)
+
+    def test_directory_page(self):
+        """Каталог групп - по алфавиту, без запросов к постам."""
+        Post.objects.create(text='Пост', author=self.author, group=self.group)
+        self.group.refresh_from_db()
+        # COUNT групп и страница групп
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('posts:group_index'))
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.empty_group, self.group],
+        )
+        self.assertContains(response, 'Постов: 1')
+        self.assertContains(response, 'Последний пост: нет')
+        self.assertContains(
+            response, reverse('posts:group_list', args=('beta',))
+        )
+
+
+class GroupCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_group_cached_by_slug(self):
+        get_group('group')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_group('group'), self.group)
+        with self.assertRaises(Http404):
+            get_group('missing')
+
+    def test_key_safe_for_memcached(self):
+        """Длинный slug не даёт CacheKeyWarning."""
+        slug = 'g' * 250
+        Group.objects.create(title='Длинная', slug=slug)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            self.assertEqual(get_group(slug).title, 'Длинная')
+
+    def test_invalidated_on_save(self):
+        """Переименование и смена slug в админке видны сразу."""
+        get_group('group')
+        self.group.title = 'Новое название'
+        self.group.slug = 'renamed'
+        with run_on_commit():
+            self.group.save()
+        self.assertEqual(get_group('renamed').title, 'Новое название')
+        with self.assertRaises(Http404):
+            get_group('group')
+
+    def test_invalidated_on_post_count_refresh(self):
+        url = reverse('posts:group_list', args=('group',))
+        self.client.get(url)
+        with run_on_commit():
+            Post.objects.create(
+                text='Пост', author=self.author, group=self.group
+            )
+        response = self.client.get(url)
+        self.assertEqual(response.context['group'].post_count, 1)
+        self.assertEqual(response.context['page_obj'].paginator.count, 1)
@@ -0,0 +1,118 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core import jobs
+from core.models import Job
+
+from ..models import Follow, Group, Post, TimelineEntry
+
+User = get_user_model()
+
+CALLS = []
+
+
+@jobs.task('tests.flaky')
+def flaky(fail):
+    CALLS.append(fail)
+    if fail:
+        raise ValueError('сбой')
+
+
+@override_settings(JOBS_EAGER=False)
+class JobQueueTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(title='test_group', slug='test_slug')
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_post_side_effects_are_queued(self):
+        """Счётчики сдвигаются сразу, раздачу по лентам делает воркер."""
+        post = Post.objects.create(
+            text='test_text', author=self.author, group=self.group
+        )
+        self.assertEqual(
+            list(Job.objects.values_list('name', flat=True)),
+            ['posts.fan_out_post'],
+        )
+        self.group.refresh_from_db()
+        self.author.profile.refresh_from_db()
+        self.assertEqual(self.group.post_count, 1)
+        self.assertEqual(self.author.profile.post_count, 1)
+        self.assertFalse(TimelineEntry.objects.exists())
+        call_command('run_workers', '--once', stdout=StringIO())
+        self.assertFalse(Job.objects.exists())
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.reader, post=post).exists()
+        )
+
+    def test_counters_shifted_without_recount(self):
+        """Запись поста не пересчитывает посты группы и автора."""
+        Post.objects.create(
+            text='test_text', author=self.author, group=self.group
+        )
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.create(
+                text='test_text_2', author=self.author, group=self.group
+            )
+        self.assertFalse([
+            query['sql'] for query in queries
+            if 'COUNT(' in query['sql'].upper()
+        ])
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 2)
+
+    def test_identical_jobs_are_merged(self):
+        """Одинаковые задачи в очереди хранятся одной строкой."""
+        for number in range(3):
+            jobs.enqueue('tests.flaky', fail=False)
+            Post.objects.create(
+                text=f'test_text_{number}', author=self.author,
+                group=self.group
+            )
+        self.assertEqual(
+            Job.objects.filter(name='tests.flaky').count(), 1
+        )
+        self.assertEqual(
+            Job.objects.filter(name='posts.fan_out_post').count(), 3
+        )
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2)
+    def test_retries_then_fails(self):
+        """Упавшая задача повторяется с паузой, затем помечается ошибкой."""
+        jobs.enqueue('tests.flaky', fail=True)
+        jobs.run_pending()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertIn('ValueError', job.last_error)
+        # Пауза перед повтором ещё не прошла
+        self.assertEqual(jobs.run_pending(), 0)
+        Job.objects.update(run_at=job.created_at)
+        with self.assertLogs('core.jobs', 'ERROR'):
+            jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertEqual(CALLS, [True, True])
+
+    def test_queue_stats_on_metrics_page(self):
+        jobs.enqueue('tests.flaky', fail=False)
+        stats = jobs.queue_stats()
+        self.assertEqual(stats['pending'], 1)
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse('request_metrics'))
+        self.assertEqual(response.context['jobs']['pending'], 1)
+        jobs.run_pending()
+        self.assertEqual(CALLS, [False])
+        self.assertEqual(jobs.queue_stats()['pending'], 0)
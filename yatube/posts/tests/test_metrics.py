@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import metrics
+
+from ..models import Post
+
+User = get_user_model()
+
+
+class RequestMetricsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Test_username')
+        Post.objects.create(text='test_text', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+    def test_server_timing_and_summary(self):
+        """Запрос получает Server-Timing и попадает в сводку по URL."""
+        response = self.client.get(reverse('posts:main_page'))
+        timing = response['Server-Timing']
+        self.assertIn('sql;desc=', timing)
+        self.assertIn('render;dur=', timing)
+        self.assertIn('total;dur=', timing)
+        self.client.get(reverse('posts:main_page'))
+        rows = {row['name']: row for row in metrics.summary()}
+        row = rows['posts:main_page']
+        self.assertEqual(row['count'], 2)
+        self.assertGreater(row['queries'], 0)
+        self.assertGreater(row['render_ms'], 0)
+        self.assertEqual(sum(n for _, n in row['time_histogram']), 2)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_disabled(self):
+        """При нулевой доле выборки метрики не собираются."""
+        response = self.client.get(reverse('posts:main_page'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(metrics.summary(), [])
+
+    def test_admin_page(self):
+        """Страница метрик доступна только персоналу."""
+        url = reverse('request_metrics')
+        self.client.get(reverse('posts:main_page'))
+        self.assertEqual(self.client.get(url).status_code, 302)
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(url)
+        self.assertContains(response, 'posts:main_page')
+        self.client.post(url)
+        names = [row['name'] for row in metrics.summary()]
+        self.assertNotIn('posts:main_page', names)
@@ -1,7 +1,12 @@
+from importlib import import_module
+from types import SimpleNamespace
+
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
 
-from ..models import Group, Post
+from ..models import Group, Post, render_text
 
 User = get_user_model()
 
@@ -60,3 +65,63 @@ class UserModelTest(TestCase):
                 self.assertEqual(
                     post._meta.get_field(field).help_text, expected_value
                 )
+
+    def test_feed_queries_use_indexes(self):
+        """Ленты читаются по составным индексам без сортировки в памяти."""
+        feeds = {
+            'post_feed_idx': Post.objects.for_feed(),
+            'post_group_feed_idx': self.group.posts.for_feed(),
+            'post_author_feed_idx': self.test_user.posts.for_feed(),
+        }
+        for index, queryset in feeds.items():
+            with self.subTest(index=index):
+                plan = queryset[:10].explain()
+                self.assertIn(index, plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_text_html_rendered_on_save(self):
+        """HTML и отрывок текста считаются при сохранении и экранируются."""
+        post = Post.objects.create(
+            text='<b>первая</b>\nвторая строка длинного-длинного поста',
+            author=self.test_user,
+        )
+        self.assertEqual(
+            post.text_html,
+            '&lt;b&gt;первая&lt;/b&gt;<br>вторая строка длинного-длинного '
+            'поста',
+        )
+        self.assertEqual(len(post.excerpt), 30)
+        self.assertTrue(post.excerpt.endswith('…'))
+        post.text = 'новый текст'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(
+            (post.text_html, post.excerpt), ('новый текст', 'новый текст')
+        )
+
+    def test_migration_renders_existing_posts(self):
+        """0012 заполняет HTML постов, созданных до неё."""
+        migration = import_module('posts.migrations.0012_post_text_html')
+        texts = ['a\nb', 'длинный текст поста, который обрежется в отрывке']
+        posts = Post.objects.filter(pk__in=[
+            Post.objects.create(text=text, author=self.test_user).pk
+            for text in texts
+        ])
+        posts.update(text_html='', excerpt='')
+        migration.BATCH_SIZE = 1
+        try:
+            migration.render_post_text(
+                apps, SimpleNamespace(connection=connection)
+            )
+        finally:
+            migration.BATCH_SIZE = 1000
+        self.assertEqual(
+            sorted(posts.values_list('text_html', 'excerpt')),
+            sorted(render_text(text) for text in texts),
+        )
+
+    def test_text_html_rendered_on_bulk_create(self):
+        post, = Post.objects.bulk_create(
+            [Post(text='a\nb', author=self.test_user)]
+        )
+        self.assertEqual(post.text_html, 'a<br>b')
@@ -0,0 +1,171 @@
+import tempfile
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core import page_cache
+from core.jobs import run_pending
+from core.models import Job
+
+from ..models import Post, User
+from .utils import run_on_commit
+
+
+# Без кеша фрагментов: перерисованная страница читает посты из базы
+@override_settings(PAGE_CACHE_TIMEOUT=60, FEED_CACHE_TIMEOUT=0, SHOW_POSTS=2)
+class PageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Кеш страниц работает только с кешем, общим для воркеров
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        cls.shared_cache = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': cls.cache_dir.name,
+        }})
+        cls.shared_cache.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.shared_cache.disable()
+        cls.cache_dir.cleanup()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.other = User.objects.create_user(
+            username='other', password='secret'
+        )
+        for number in range(3):
+            Post.objects.create(text=f'Пост {number}', author=cls.author)
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:main_page')
+
+    def expire(self):
+        """Переводит закешированную главную страницу в устаревшие."""
+        key = page_cache.PAGE_KEY.format(
+            page_cache.page_key(RequestFactory().get(self.url))
+        )
+        entry = cache.get(key)
+        entry['expires'] = 0
+        cache.set(key, entry)
+
+    def test_anonymous_page_served_from_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+        stats = page_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_varies_on_page(self):
+        """Разные страницы ленты - разные записи кеша."""
+        first = self.client.get(self.url)
+        second = self.client.get(self.url, {'page': 2})
+        self.assertNotEqual(first.content, second.content)
+        self.assertEqual(
+            self.client.get(self.url, {'page': 2}).content, second.content
+        )
+
+    def test_session_bearing_requests_bypass_cache(self):
+        self.client.force_login(self.author)
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(page_cache.stats()['hits'], 0)
+
+    def test_csrf_and_cookie_responses_not_stored(self):
+        request = RequestFactory().get(self.url)
+        response = self.client.get(self.url)
+        self.assertTrue(page_cache.cacheable_response(request, response))
+        request.META['CSRF_COOKIE_USED'] = True
+        self.assertFalse(page_cache.cacheable_response(request, response))
+        request = RequestFactory().get(self.url)
+        response.set_cookie('name', 'value')
+        self.assertFalse(page_cache.cacheable_response(request, response))
+
+    def test_write_invalidates(self):
+        """После записи поста устаревшая страница не отдаётся."""
+        self.client.get(self.url)
+        with run_on_commit():
+            Post.objects.create(text='Новый пост', author=self.author)
+        self.assertContains(self.client.get(self.url), 'Новый пост')
+
+    def test_stale_while_revalidate(self):
+        """Устаревшая страница отдаётся, а перерисовывается задачей."""
+        self.client.get(self.url)
+        # Изменение без сигналов: кеш о нём не знает
+        Post.objects.filter(pk=self.post.pk).update(
+            text_html='Изменённый текст'
+        )
+        self.expire()
+        with override_settings(JOBS_EAGER=False):
+            stale = self.client.get(self.url)
+            self.client.get(self.url)
+        self.assertNotContains(stale, 'Изменённый текст')
+        self.assertEqual(page_cache.stats()['stale'], 2)
+        self.assertEqual(
+            Job.objects.filter(name='core.refresh_page').count(), 1
+        )
+        run_pending()
+        with self.assertNumQueries(0):
+            fresh = self.client.get(self.url)
+        self.assertContains(fresh, 'Изменённый текст')
+
+    def test_eager_stale_page_rendered_normally(self):
+        """Без воркеров устаревшая страница рисуется заново обычным
+        путём, а не вторым проходом по middleware из того же запроса.
+        """
+        self.client.get(self.url)
+        Post.objects.filter(pk=self.post.pk).update(text_html='Правка')
+        self.expire()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Правка')
+        self.assertIsNotNone(response.context)
+        stats = page_cache.stats()
+        self.assertEqual((stats['stale'], stats['misses']), (0, 2))
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get(self.url), 'Правка')
+
+    def test_write_keeps_unrelated_pages(self):
+        """Пост автора сбрасывает только страницы его областей."""
+        profile = reverse('posts:profile', args=(self.other.username,))
+        self.client.get(profile)
+        self.client.get(self.url)
+        with run_on_commit():
+            Post.objects.create(text='Новый пост', author=self.author)
+        with self.assertNumQueries(0):
+            self.client.get(profile)
+        self.assertContains(self.client.get(self.url), 'Новый пост')
+
+    def test_login_keeps_pages(self):
+        self.client.get(self.url)
+        self.client_class().login(username='other', password='secret')
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_process_local_cache_rejected(self):
+        locmem = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        with override_settings(CACHES=locmem):
+            with self.assertRaises(ImproperlyConfigured):
+                self.client_class().get(self.url)
+
+    def test_conditional_get_from_cache(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(page_cache.stats()['hits'], 1)
+
+    def test_other_views_not_cached(self):
+        url = reverse('posts:search')
+        self.client.get(url, {'q': 'Пост'})
+        self.client.get(url, {'q': 'Пост'})
+        self.assertEqual(page_cache.stats()['misses'], 0)
@@ -0,0 +1,183 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..counts import (counter_count, estimated_count, group_scope,
+                      recount_post_counts)
+from ..models import FeedCounter, Group, Post
+from ..paginator import CursorPage
+
+User = get_user_model()
+
+
+@override_settings(CURSOR_PAGINATION=True, SHOW_POSTS=10)
+class CursorPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test_description',
+        )
+        cls.author = User.objects.create_user(username='Test_username')
+        # bulk_create даёт одинаковые pub_date: порядок держится на id
+        Post.objects.bulk_create(
+            Post(text=f'test_text_{i}', author=cls.author, group=cls.group)
+            for i in range(25)
+        )
+        cls.expected = list(
+            Post.objects.order_by('-pub_date', '-pk')
+            .values_list('pk', flat=True)
+        )
+
+    def walk_forward(self, url):
+        pages = []
+        cursor = None
+        while True:
+            response = self.client.get(
+                url, {'cursor': cursor} if cursor else {}
+            )
+            page_obj = response.context['page_obj']
+            self.assertIsInstance(page_obj, CursorPage)
+            pages.append(page_obj)
+            if not page_obj.has_next():
+                return pages
+            cursor = page_obj.next_cursor
+
+    def test_forward_pages_cover_feed_once(self):
+        """Проход по курсорам вперёд выдаёт всю ленту без повторов."""
+        urls = (
+            reverse('posts:main_page'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                pages = self.walk_forward(url)
+                self.assertEqual([len(page) for page in pages], [10, 10, 5])
+                self.assertFalse(pages[0].has_previous())
+                ids = [post.pk for page in pages for post in page]
+                self.assertEqual(ids, self.expected)
+
+    def test_previous_cursor_returns_same_page(self):
+        """Курсор «назад» возвращает предыдущую страницу целиком."""
+        url = reverse('posts:main_page')
+        pages = self.walk_forward(url)
+        for current, previous in zip(pages[:0:-1], pages[-2::-1]):
+            response = self.client.get(
+                url, {'cursor': current.previous_cursor}
+            )
+            page_obj = response.context['page_obj']
+            self.assertEqual(
+                [post.pk for post in page_obj],
+                [post.pk for post in previous],
+            )
+            self.assertEqual(page_obj.next_cursor, previous.next_cursor)
+
+    def test_broken_cursor_not_found(self):
+        """Подделанный или битый курсор - 404, а не ошибка базы."""
+        def token(data):
+            raw = json.dumps(data).encode()
+            return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+        date = '2020-01-01T00:00:00+00:00'
+        cursors = (
+            'not-a-cursor',
+            token([date, 1]),
+            token({'d': date, 'i': 10 ** 30}),
+            token({'d': date, 'i': -1}),
+            token({'d': date, 'i': '5'}),
+            token({'d': date, 'i': 5, 'x': 1}),
+            token({'d': date, 'i': 5, 'b': 2}),
+            token({'d': '2020-13-01T00:00:00+00:00', 'i': 5}),
+            token({'d': '2020-01-01T00:00:00', 'i': 5}),
+            token({'d': '9999-12-31T23:00:00-14:00', 'i': 5}),
+            token({'d': 5, 'i': 5}),
+        )
+        url = reverse('posts:main_page')
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+        response = self.client.get(url, {'cursor': token({'d': date, 'i': 5})})
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(POSTS_COUNT_STRATEGY='counter')
+class CountStrategyTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test_description',
+        )
+        cls.other_group = Group.objects.create(
+            title='other_group',
+            slug='other_slug',
+            description='test_description',
+        )
+        cls.author = User.objects.create_user(username='Test_username')
+        for i in range(15):
+            Post.objects.create(
+                text=f'test_text_{i}', author=cls.author, group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def group_count(self, group):
+        return counter_count(group.posts.all(), group_scope(group.pk))
+
+    def test_counter_skips_count_query(self):
+        """Повторный показ ленты не выполняет SELECT COUNT."""
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.context['page_obj'].paginator.count, 15)
+        self.assertFalse(
+            any('COUNT' in query['sql'] for query in queries)
+        )
+
+    def test_counters_follow_post_changes(self):
+        """Счётчики меняются при создании, переносе и удалении поста."""
+        self.assertEqual(self.group_count(self.group), 15)
+        self.assertEqual(self.group_count(self.other_group), 0)
+        post = Post.objects.create(
+            text='test_text', author=self.author, group=self.group
+        )
+        self.assertEqual(self.group_count(self.group), 16)
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(self.group_count(self.group), 15)
+        self.assertEqual(self.group_count(self.other_group), 1)
+        post.delete()
+        self.assertEqual(self.group_count(self.other_group), 0)
+
+    def test_feed_counter_stored_in_database(self):
+        """Счётчик всей ленты не теряется при очистке кеша."""
+        posts = Post.objects.all()
+        self.assertEqual(counter_count(posts, 'all'), 15)
+        post = Post.objects.create(text='test_text', author=self.author)
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(counter_count(posts, 'all'), 16)
+        post.delete()
+        self.assertEqual(counter_count(posts, 'all'), 15)
+        FeedCounter.objects.filter(scope='all').update(post_count=0)
+        recount_post_counts()
+        self.assertEqual(counter_count(posts, 'all'), 15)
+
+    def test_estimated_count_for_whole_feed(self):
+        """Оценка размера всей ленты не ниже реального числа постов."""
+        estimate = estimated_count(Post.objects.all(), 'all')
+        self.assertGreaterEqual(estimate, Post.objects.count())
@@ -0,0 +1,61 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post
+
+User = get_user_model()
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Test_username')
+        cls.rare = Post.objects.create(
+            text='Длинный пост, где слово кот встречается один раз',
+            author=cls.author,
+        )
+        cls.frequent = Post.objects.create(
+            text='Кот и кот', author=cls.author
+        )
+        Post.objects.create(text='Про собак', author=cls.author)
+
+    def search(self, query):
+        response = self.client.get(reverse('posts:search'), {'q': query})
+        return [post.pk for post in response.context['page_obj']]
+
+    def test_results_ranked_by_relevance(self):
+        """Поиск находит посты со всеми словами, релевантные выше."""
+        self.assertEqual(
+            self.search('КОТ'), [self.frequent.pk, self.rare.pk]
+        )
+        self.assertEqual(self.search('кот длинный'), [self.rare.pk])
+        self.assertEqual(self.search('"'), [])
+
+    def test_index_follows_changes(self):
+        """Индекс обновляется при правке и bulk_create постов."""
+        self.rare.text = 'Теперь про собак'
+        self.rare.save()
+        self.assertEqual(self.search('кот'), [self.frequent.pk])
+        Post.objects.bulk_create([
+            Post(text='Кот из импорта', author=self.author)
+        ])
+        self.assertEqual(len(self.search('импорта')), 1)
+
+    def test_fallback_without_fts(self):
+        """Без FTS5 поиск работает через LIKE."""
+        with mock.patch('posts.search.search_available', return_value=False):
+            self.assertEqual(
+                set(self.search('кот')), {self.frequent.pk, self.rare.pk}
+            )
+
+    @override_settings(SHOW_POSTS=1)
+    def test_pagination_keeps_query(self):
+        """Ссылки пагинатора сохраняют поисковый запрос."""
+        response = self.client.get(reverse('posts:search'), {'q': 'кот'})
+        self.assertContains(
+            response, 'href="?q=%D0%BA%D0%BE%D1%82&amp;page=2"'
+        )
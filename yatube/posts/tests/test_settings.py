@@ -0,0 +1,78 @@
+import importlib.util
+import os
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+PROD_ENV = {
+    'DJANGO_SECRET_KEY': 'secret',
+    'DJANGO_ALLOWED_HOSTS': 'yatube.example.com',
+    'CACHE_BACKEND': 'redis',
+    'CACHE_LOCATION': 'redis://cache:6379/0',
+}
+
+
+def load_prod_settings(**environ):
+    """Исполняет модуль настроек prod с переменными окружения environ,
+    не подменяя уже загруженные настройки.
+    """
+    env = {
+        name: value for name, value in os.environ.items()
+        if name not in PROD_ENV
+    }
+    env.update({**PROD_ENV, **environ})
+    env = {name: value for name, value in env.items() if value is not None}
+    spec = importlib.util.find_spec('yatube.settings.prod')
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(os.environ, env, clear=True):
+        spec.loader.exec_module(module)
+    return module
+
+
+class ProdSettingsTest(SimpleTestCase):
+    def test_configured_from_environment(self):
+        prod = load_prod_settings()
+        self.assertEqual(prod.SECRET_KEY, 'secret')
+        self.assertEqual(prod.ALLOWED_HOSTS, ['yatube.example.com'])
+        self.assertEqual(
+            prod.CACHES['default']['LOCATION'], 'redis://cache:6379/0'
+        )
+        self.assertEqual(
+            prod.SESSION_ENGINE, 'django.contrib.sessions.backends.cached_db'
+        )
+
+    def test_required_variables(self):
+        for name in ('DJANGO_SECRET_KEY', 'DJANGO_ALLOWED_HOSTS',
+                     'CACHE_LOCATION'):
+            with self.subTest(name=name):
+                with self.assertRaises(ImproperlyConfigured):
+                    load_prod_settings(**{name: None})
+
+    def test_cache_backends(self):
+        """Кеш в памяти процесса расходится между воркерами."""
+        with self.assertRaises(ImproperlyConfigured):
+            load_prod_settings(CACHE_BACKEND='locmem')
+        prod = load_prod_settings(
+            CACHE_BACKEND='memcached', CACHE_LOCATION='cache1:11211'
+        )
+        self.assertEqual(
+            prod.CACHES['default']['LOCATION'], ['cache1:11211']
+        )
+        # Замена без сервера кеша: файлы, общие для процессов машины
+        prod = load_prod_settings(CACHE_BACKEND='file', CACHE_LOCATION=None)
+        self.assertTrue(
+            prod.CACHES['default']['BACKEND'].endswith('FileBasedCache')
+        )
+
+    def test_cache_backend_importable(self):
+        """Библиотеки бэкендов кеша объявлены в requirements.txt."""
+        for backend, location in (('redis', 'redis://cache:6379/0'),
+                                  ('memcached', 'cache1:11211')):
+            with self.subTest(backend=backend):
+                prod = load_prod_settings(
+                    CACHE_BACKEND=backend, CACHE_LOCATION=location
+                )
+                with override_settings(CACHES=prod.CACHES):
+                    self.assertIsNotNone(caches['default'])
@@ -1,8 +1,12 @@
 from django import forms
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from ..counts import recount_post_counts
 from ..models import Group, Post
 
 User = get_user_model()
@@ -201,3 +205,70 @@ class UserViewTest(TestCase):
         obj_2 = response_2.context.get('page_obj').object_list
         self.assertIn(UserViewTest.post, obj)
         self.assertNotIn(UserViewTest.post, obj_2)
+
+
+@override_settings(FEED_CACHE_TIMEOUT=0)
+class PostListQueriesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test_description',
+        )
+        cls.author = User.objects.create_user(
+            username='Test_username', first_name='Имя', last_name='Фамилия')
+        Post.objects.bulk_create(
+            Post(text=f'test_text_{i}', author=cls.author, group=cls.group)
+            for i in range(20)
+        )
+        recount_post_counts()
+
+    def count_queries(self, url, page_size):
+        # Оба замера с пустым кешем: иначе второй не читает группу
+        cache.clear()
+        with override_settings(SHOW_POSTS=page_size):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+        self.assertEqual(len(response.context['page_obj']), page_size)
+        return len(queries)
+
+    def test_list_pages_constant_number_of_queries(self):
+        """Число запросов на страницах-списках не зависит
+        от количества постов на странице.
+        """
+        urls = (
+            reverse('posts:main_page'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.count_queries(url, 2),
+                    self.count_queries(url, 20),
+                )
+
+
+class MissingProfileTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create не отправляет сигнал, который создаёт профиль
+        User.objects.bulk_create([User(username='no_profile')])
+        cls.author = User.objects.get(username='no_profile')
+        cls.post = Post.objects.create(text='test_text', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_author_pages_without_profile(self):
+        urls = (
+            reverse('posts:profile', args=(self.author.username,)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+        author = User.objects.get(pk=self.author.pk)
+        self.assertTrue(hasattr(author, 'profile'))
@@ -0,0 +1,18 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@contextmanager
+def run_on_commit(using=DEFAULT_DB_ALIAS):
+    """Выполняет функции transaction.on_commit, отложенные в блоке.
+
+    TestCase не фиксирует транзакцию теста, и без этого сброс кешей
+    после записи в тестах не выполнился бы вовсе.
+    """
+    connection = connections[using]
+    start = len(connection.run_on_commit)
+    yield
+    while len(connection.run_on_commit) > start:
+        _, func = connection.run_on_commit.pop(start)
+        func()
@@ -0,0 +1,194 @@
+"""Ленты подписок с раздачей постов при записи.
+
+Новый пост сразу копируется строкой TimelineEntry каждому подписчику
+автора (fan-out on write), и страница ленты читается одним проходом
+по индексу (user, -pub_date, -post). У авторов с числом подписчиков
+больше TIMELINE_FANOUT_LIMIT раздача слишком дорога: их посты
+подмешиваются при чтении из индекса постов автора (fan-out on read).
+Когда подписчиков снова становится не больше предела, последние посты
+автора раздаются всем подписчикам заново: написанные за время
+популярности в их лентах отсутствуют.
+"""
+import heapq
+from itertools import islice
+
+from django.conf import settings
+from django.db import models
+from users.models import Profile
+
+from .models import Follow, Post, TimelineEntry
+
+BATCH_SIZE = 1000
+
+
+def is_celebrity(author_id):
+    return Profile.objects.filter(
+        user_id=author_id,
+        follower_count__gt=settings.TIMELINE_FANOUT_LIMIT,
+    ).exists()
+
+
+def shift_follower_count(author_id, delta):
+    queryset = Profile.objects.filter(user_id=author_id)
+    if delta < 0:
+        queryset = queryset.filter(follower_count__gte=-delta)
+    queryset.update(follower_count=models.F('follower_count') + delta)
+
+
+def fanout_resumed(author_id):
+    """После отписки у автора ровно TIMELINE_FANOUT_LIMIT подписчиков:
+    его посты снова раздаются при записи.
+    """
+    return Profile.objects.filter(
+        user_id=author_id,
+        follower_count=settings.TIMELINE_FANOUT_LIMIT,
+    ).exists()
+
+
+def _bulk_insert(entries):
+    entries = iter(entries)
+    while True:
+        batch = list(islice(entries, BATCH_SIZE))
+        if not batch:
+            break
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def fan_out_post(post):
+    """Раздаёт новый пост в ленты подписчиков автора."""
+    if is_celebrity(post.author_id):
+        return
+    followers = (
+        Follow.objects.filter(author_id=post.author_id)
+        .values_list('user_id', flat=True).iterator()
+    )
+    _bulk_insert(
+        TimelineEntry(
+            user_id=user_id,
+            post_id=post.pk,
+            author_id=post.author_id,
+            pub_date=post.pub_date,
+        )
+        for user_id in followers
+    )
+
+
+def fan_out_posts(posts):
+    """Раздаёт пакет постов одного автора: подписчики читаются раз."""
+    if not posts or is_celebrity(posts[0].author_id):
+        return
+    followers = list(
+        Follow.objects.filter(author_id=posts[0].author_id)
+        .values_list('user_id', flat=True)
+    )
+    _bulk_insert(
+        TimelineEntry(
+            user_id=user_id,
+            post_id=post.pk,
+            author_id=post.author_id,
+            pub_date=post.pub_date,
+        )
+        for post in posts
+        for user_id in followers
+    )
+
+
+def backfill(user_id, author_id):
+    """Добавляет в ленту нового подписчика последние посты автора."""
+    if is_celebrity(author_id):
+        return
+    posts = (
+        Post.objects.filter(author_id=author_id)
+        .values_list('pk', 'pub_date')[:settings.TIMELINE_BACKFILL]
+    )
+    _bulk_insert(
+        TimelineEntry(
+            user_id=user_id, post_id=post_id,
+            author_id=author_id, pub_date=pub_date,
+        )
+        for post_id, pub_date in posts
+    )
+
+
+def backfill_followers(author_id):
+    """Раздаёт последние посты автора всем его подписчикам; строки,
+    которые уже есть в лентах, пропускаются.
+    """
+    if is_celebrity(author_id):
+        return
+    posts = list(
+        Post.objects.filter(author_id=author_id)
+        .values_list('pk', 'pub_date')[:settings.TIMELINE_BACKFILL]
+    )
+    followers = (
+        Follow.objects.filter(author_id=author_id)
+        .values_list('user_id', flat=True).iterator()
+    )
+    _bulk_insert(
+        TimelineEntry(
+            user_id=user_id, post_id=post_id,
+            author_id=author_id, pub_date=pub_date,
+        )
+        for user_id in followers
+        for post_id, pub_date in posts
+    )
+
+
+def remove_author(user_id, author_id):
+    TimelineEntry.objects.filter(user_id=user_id, author_id=author_id).delete()
+
+
+class TimelineFeed:
+    """Лента подписок user в виде последовательности для Paginator.
+
+    Строки из TimelineEntry сливаются с постами авторов, которые
+    раздаются при чтении. Их строки в TimelineEntry (если автор стал
+    популярным уже после раздачи) пропускаются, чтобы посты не
+    повторялись.
+    """
+    def __init__(self, user):
+        self.user = user
+        self.celebrities = list(
+            Follow.objects.filter(
+                user=user,
+                author__profile__follower_count__gt=(
+                    settings.TIMELINE_FANOUT_LIMIT
+                ),
+            ).values_list('author_id', flat=True)
+        )
+
+    def entries(self):
+        queryset = TimelineEntry.objects.filter(user=self.user)
+        if self.celebrities:
+            queryset = queryset.exclude(author_id__in=self.celebrities)
+        return queryset
+
+    def count(self):
+        total = self.entries().count()
+        if self.celebrities:
+            total += Profile.objects.filter(
+                user_id__in=self.celebrities
+            ).aggregate(total=models.Sum('post_count'))['total'] or 0
+        return total
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        sources = [
+            self.entries().order_by('-pub_date', '-post_id')
+            .values_list('pub_date', 'post_id')[:stop]
+        ]
+        if self.celebrities:
+            sources.append(
+                Post.objects.filter(author_id__in=self.celebrities)
+                .order_by('-pub_date', '-id')
+                .values_list('pub_date', 'id')[:stop]
+            )
+        merged = heapq.merge(*sources, reverse=True)
+        ids = [post_id for _, post_id in islice(merged, start, stop)]
+        posts = Post.objects.for_feed().in_bulk(ids)
+        return [posts[post_id] for post_id in ids if post_id in posts]
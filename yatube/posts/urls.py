@@ -6,11 +6,30 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='main_page'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     # Профайл пользователя
     path('profile/<str:username>/', views.profile, name='profile'),
     # Просмотр записи
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('search/', views.search, name='search'),
+    path('follow/', views.follow_index, name='follow_index'),
+    path(
+        'profile/<str:username>/follow/',
+        views.profile_follow,
+        name='profile_follow'
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        views.profile_unfollow,
+        name='profile_unfollow'
+    ),
     path('create/', views.post_create, name='post_create'),
+    path('api/posts/', views.post_bulk_create, name='post_bulk_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path(
+        'feed-cache/stats/',
+        views.feed_cache_stats,
+        name='feed_cache_stats'
+    ),
 ]
@@ -1,51 +1,140 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import get_object_or_404, redirect, render
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from core import page_cache
+from core.db import read_replica
+from users.backends import basic_auth_user
+from users.models import get_profile
 
+from . import bulk, caching
+from .counts import author_scope, group_scope
+from .details import detail_scopes, get_post
 from .forms import PostForm
-from .models import Group, Post, User
+from .groups import get_group
+from .models import Follow, Group, Post, User
 from .paginator import get_paginator
+from .timeline import TimelineFeed
+
 
+def render_feed(request, template, post_list, scope, context, count=None,
+                variant=''):
+    """Страница ленты: ETag и Last-Modified проверяются до пагинации."""
+    page_cache.depends_on(request, [scope])
+
+    def render_page():
+        context['page_obj'] = get_paginator(post_list, request, scope, count)
+        context['feed_scope'] = scope
+        return TemplateResponse(request, template, context)
+
+    return caching.conditional_response(
+        request,
+        caching.feed_etag(request, scope, variant),
+        caching.feed_last_modified(scope, post_list),
+        render_page,
+    )
 
+
+@read_replica
 def index(request):
-    post_list = Post.objects.all()
-    page_obj = get_paginator(post_list, request)
-    context = {
-        'page_obj': page_obj,
-    }
-    return render(request, 'posts/index.html', context)
+    post_list = Post.objects.for_feed()
+    return render_feed(request, 'posts/index.html', post_list, 'all', {})
+
+
+@read_replica
+def group_index(request):
+    """Каталог групп: число постов и дата последнего хранятся в строке
+    группы, поэтому страница - один запрос без агрегатов по постам.
+    """
+    group_list = Group.objects.only(
+        'title', 'slug', 'description', 'post_count', 'last_post_date'
+    ).order_by('title')
+    page_obj = get_paginator(group_list, request, cursor=False)
+    return TemplateResponse(
+        request, 'posts/group_index.html', {'page_obj': page_obj}
+    )
 
 
+@read_replica
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
-    page_obj = get_paginator(post_list, request)
+    group = get_group(slug)
+    post_list = group.posts.for_feed()
     context = {
-        'page_obj': page_obj,
         'group': group,
     }
-    return render(request, 'posts/group_list.html', context)
+    return render_feed(
+        request, 'posts/group_list.html', post_list,
+        group_scope(group.pk), context, count=group.post_count,
+    )
 
 
+@read_replica
 def profile(request, username):
     # Здесь код запроса к модели и создание словаря контекста
-    author = get_object_or_404(User, username=username)
-    post_list = Post.objects.filter(author=author)
-    post_count = author.posts.count()
-    page_obj = get_paginator(post_list, request)
+    author = get_object_or_404(
+        User.objects.select_related('profile'), username=username
+    )
+    post_list = author.posts.for_feed()
+    post_count = get_profile(author).post_count
+    following = request.user.is_authenticated and Follow.objects.filter(
+        user=request.user, author=author
+    ).exists()
     context = {
-        'page_obj': page_obj,
         'author': author,
         'post_count': post_count,
+        'following': following,
     }
-    return render(request, 'posts/profile.html', context)
+    return render_feed(
+        request, 'posts/profile.html', post_list,
+        author_scope(author.pk), context, count=post_count,
+        # Подписка не меняет ленту автора, но меняет кнопку на странице
+        variant='following' if following else '',
+    )
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_post(post_id)
+    post_count = get_profile(post.author).post_count
+    # Имя автора и название группы меняются без правки поста: их
+    # учитывают версии и время изменения областей автора и группы
+    scopes = detail_scopes(post)
+    page_cache.depends_on(request, scopes)
+    versions = ':'.join(str(caching.feed_version(scope)) for scope in scopes)
+    etag = hashlib.md5(
+        f'{post_id}:{post.updated_at}:{post_count}:{versions}:'
+        f'{request.user.pk}'.encode()
+    ).hexdigest()
+    last_modified = caching.scopes_last_modified(scopes, post.updated_at)
+
+    def render_page():
+        context = {
+            'post': post,
+        }
+        return TemplateResponse(request, 'posts/post_detail.html', context)
+
+    return caching.conditional_response(
+        request, etag, last_modified, render_page
+    )
+
+
+@read_replica
+def search(request):
+    query = request.GET.get('q', '').strip()
+    post_list = Post.objects.for_feed().search(query)
+    page_obj = get_paginator(post_list, request, cursor=False)
     context = {
-        'post': post,
+        'page_obj': page_obj,
+        'query': query,
+        'page_prefix': urlencode({'q': query}) + '&',
     }
-    return render(request, 'posts/post_detail.html', context)
+    return TemplateResponse(request, 'posts/search.html', context)
 
 
 @login_required
@@ -59,7 +148,28 @@ def post_create(request):
             post.save()
             username = author.username
             return redirect('posts:profile', username)
-    return render(request, 'posts/post_create.html', {'form': form})
+    return TemplateResponse(request, 'posts/post_create.html', {'form': form})
+
+
+@csrf_exempt
+@require_POST
+def post_bulk_create(request):
+    """JSON API: создаёт пакет постов, вход - по Basic-авторизации."""
+    user = basic_auth_user(request)
+    if user is None:
+        response = JsonResponse({'error': 'Нужна авторизация'}, status=401)
+        response['WWW-Authenticate'] = 'Basic realm="yatube"'
+        return response
+    try:
+        items = bulk.parse_items(request.body)
+    except ValueError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    post_forms = bulk.build_forms(items)
+    errors = bulk.errors(post_forms)
+    if errors:
+        return JsonResponse({'errors': errors}, status=400)
+    ids = bulk.create_posts(user, post_forms)
+    return JsonResponse({'ids': ids}, status=201)
 
 
 @login_required
@@ -71,10 +181,42 @@ def post_edit(request, post_id):
             return redirect('posts:post_detail', post_id)
         form.save()
         return redirect('posts:post_detail', post_id)
-    return render(
+    return TemplateResponse(
         request, 'posts/post_create.html',
         {
             'form': form,
             'post': post
         }
     )
+
+
+@login_required
+def follow_index(request):
+    feed = TimelineFeed(request.user)
+    page_obj = get_paginator(feed, request, count=feed.count(), cursor=False)
+    return TemplateResponse(
+        request, 'posts/follow.html', {'page_obj': page_obj}
+    )
+
+
+@login_required
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        Follow.objects.get_or_create(user=request.user, author=author)
+    return redirect('posts:profile', username)
+
+
+@login_required
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    follow = Follow.objects.filter(user=request.user, author=author).first()
+    if follow is not None:
+        # delete() экземпляра, чтобы сработал сигнал очистки ленты
+        follow.delete()
+    return redirect('posts:profile', username)
+
+
+@staff_member_required
+def feed_cache_stats(request):
+    return JsonResponse(caching.stats())
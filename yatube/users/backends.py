@@ -0,0 +1,62 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from core.caches import is_process_local
+
+USER_KEY = 'users:user:{}'
+
+
+def user_key(user_id):
+    return USER_KEY.format(user_id)
+
+
+def forget_user(user_id):
+    cache.delete(user_key(user_id))
+
+
+def user_cache_timeout():
+    """Удаление записи сигналом видно только своему процессу, если кеш
+    не общий: там пользователь живёт USER_LOCAL_CACHE_TIMEOUT секунд,
+    чтобы смена пароля или is_active в другом воркере не ждала час.
+    """
+    if is_process_local():
+        return settings.USER_LOCAL_CACHE_TIMEOUT
+    return settings.USER_CACHE_TIMEOUT
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кеша.
+
+    AuthenticationMiddleware загружает пользователя на каждый запрос;
+    с этим бэкендом строка User читается из базы раз в
+    user_cache_timeout(). Сигналы users удаляют запись при сохранении
+    пользователя (в том числе при смене пароля и входе) и при удалении.
+    """
+    def get_user(self, user_id):
+        key = user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, user_cache_timeout())
+        return user
+
+
+def basic_auth_user(request):
+    """Пользователь из заголовка Authorization: Basic или None."""
+    scheme, _, credentials = request.META.get(
+        'HTTP_AUTHORIZATION', ''
+    ).partition(' ')
+    if scheme.lower() != 'basic':
+        return None
+    try:
+        decoded = base64.b64decode(credentials, validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    username, _, password = decoded.partition(':')
+    return authenticate(request, username=username, password=password)
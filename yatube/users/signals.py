@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import forget_user
+from .models import Profile, User
+
+
+@receiver(post_save, sender=User)
+def create_profile(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        Profile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Пароль, имя и is_active из кеша бэкенда не должны устаревать."""
+    forget_user(instance.pk)
@@ -0,0 +1,85 @@
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..backends import CachedModelBackend
+from ..models import User
+
+
+class CachedModelBackendTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', password='old-password-1'
+        )
+        self.backend = CachedModelBackend()
+
+    def test_user_cached(self):
+        """Повторная загрузка пользователя сессии не ходит в базу."""
+        self.backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.pk)
+        self.assertEqual(user, self.user)
+
+    def test_invalidated_on_save(self):
+        self.backend.get_user(self.user.pk)
+        self.user.first_name = 'Новое'
+        self.user.save()
+        with self.assertNumQueries(1):
+            user = self.backend.get_user(self.user.pk)
+        self.assertEqual(user.first_name, 'Новое')
+
+    def test_inactive_and_deleted(self):
+        self.backend.get_user(self.user.pk)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+        self.user.delete()
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_page_view_queries(self):
+        """Сессия и пользователь на странице вошедшего берутся из кеша."""
+        self.client.login(username='reader', password='old-password-1')
+        url = reverse('about:author')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_password_change_logs_out_other_sessions(self):
+        """После смены пароля старая сессия не принимается."""
+        other = self.client_class()
+        other.login(username='reader', password='old-password-1')
+        other.get(reverse('about:author'))
+        self.user.set_password('new-password-2')
+        self.user.save()
+        response = other.get(reverse('about:author'))
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def get_user_later(self, seconds):
+        later = time.time() + seconds
+        with mock.patch('time.time', return_value=later):
+            return self.backend.get_user(self.user.pk)
+
+    @override_settings(USER_LOCAL_CACHE_TIMEOUT=5)
+    def test_process_local_cache_expires_quickly(self):
+        """Смена пароля в другом воркере видна через секунды."""
+        self.backend.get_user(self.user.pk)
+        with self.assertNumQueries(1):
+            self.get_user_later(6)
+
+    def test_shared_cache_keeps_user(self):
+        with tempfile.TemporaryDirectory() as location:
+            shared = {'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            }}
+            with override_settings(CACHES=shared):
+                self.backend.get_user(self.user.pk)
+                with self.assertNumQueries(0):
+                    self.get_user_later(60)
@@ -0,0 +1,17 @@
+"""
+ASGI config for yatube project.
+
+Django 2.2 не поддерживает ASGI сам: приложение строит channels 2
+(см. yatube/routing.py), запуск - daphne yatube.asgi:application.
+"""
+
+import os
+
+import django
+from channels.routing import get_default_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+django.setup()
+
+application = get_default_application()
@@ -0,0 +1,13 @@
+"""Маршруты ASGI: все HTTP-запросы - обычному обработчику Django.
+
+Запрос проходит через MIDDLEWARE и ROOT_URLCONF, как и под WSGI:
+ETag, кеш страниц, сжатие и метрики работают одинаково под обоими
+серверами.
+"""
+from channels.routing import ProtocolTypeRouter
+
+from core.asgi import AsgiHandler
+
+application = ProtocolTypeRouter({
+    'http': AsgiHandler,
+})
@@ -0,0 +1,17 @@
+"""Профиль настроек выбирается переменной окружения DJANGO_ENV.
+
+dev (по умолчанию), test или prod. Профиль можно указать и напрямую:
+DJANGO_SETTINGS_MODULE=yatube.settings.prod.
+"""
+import os
+
+DJANGO_ENV = os.environ.get('DJANGO_ENV', 'dev')
+
+if DJANGO_ENV == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif DJANGO_ENV == 'test':
+    from .test import *  # noqa: F401,F403
+elif DJANGO_ENV == 'dev':
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ValueError(f'Неизвестный профиль настроек DJANGO_ENV={DJANGO_ENV}')
@@ -0,0 +1,186 @@
+"""Общие настройки всех профилей."""
+import os
+
+SHOW_POSTS = 10   # Количество отображаемых постов на странице
+# Курсорная пагинация лент (?cursor=) вместо номеров страниц (?page=)
+CURSOR_PAGINATION = False
+# Подсчёт постов для номеров страниц: exact, counter, cached, estimated
+POSTS_COUNT_STRATEGY = 'exact'
+POSTS_COUNT_CACHE_TTL = 60
+# Время жизни фрагментов лент в кеше, 0 - кеш выключен
+FEED_CACHE_TIMEOUT = 60 * 60
+# Через сколько секунд пост в кеше страницы поста пересчитывается,
+# 0 - кеш выключен
+POST_DETAIL_CACHE_TIMEOUT = 5 * 60
+# Кеш страниц для анонимных посетителей: сколько секунд страница
+# свежая, 0 - кеш выключен
+PAGE_CACHE_TIMEOUT = 0
+# Сколько ещё секунд отдаётся устаревшая страница, пока она
+# перерисовывается в фоне
+PAGE_CACHE_STALE_TIMEOUT = 10 * 60
+PAGE_CACHE_VIEWS = [
+    'posts:main_page',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+    'about:author',
+    'about:tech',
+]
+# Сколько постов можно создать одним запросом к API
+POSTS_BULK_LIMIT = 500
+# Время жизни групп в кеше по slug (posts.groups)
+GROUP_CACHE_TIMEOUT = 60 * 60
+# Авторам с большим числом подписчиков посты не раздаются по лентам
+# при публикации, а подмешиваются при чтении
+TIMELINE_FANOUT_LIMIT = 1000
+# Сколько последних постов автора попадает в ленту нового подписчика
+TIMELINE_BACKFILL = 200
+# Фоновые задачи выполняются сразу, без воркеров run_workers
+JOBS_EAGER = True
+JOBS_MAX_ATTEMPTS = 5
+# Через сколько секунд задачу упавшего воркера можно взять заново
+JOBS_LOCK_TIMEOUT = 5 * 60
+# Доля запросов, для которых собираются метрики, 0 - сбор выключен
+REQUEST_METRICS_SAMPLE_RATE = 1.0
+# Компилировать все шаблоны при старте WSGI-процесса
+WARM_TEMPLATES = False
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+SECRET_KEY = 'bckxf+=g%)jf&d^2&c8xduda++$wm%@!i4lc77^===+df&y+e9'
+
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+INSTALLED_APPS = [
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
+    'core.apps.CoreConfig',
+    'about.apps.AboutConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.db.ReadReplicaMiddleware',
+    'core.middleware.PageCacheMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                # Добавлен конеткст-процессор
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+# Используется channels: yatube/asgi.py
+ASGI_APPLICATION = 'yatube.routing.application'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+# PRAGMA для каждого нового соединения SQLite
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение - размер в килобайтах
+    'cache_size': -64 * 1024,
+}
+# Alias базы для чтения в view с core.db.read_replica, если он описан
+DATABASE_READ_ALIAS = 'replica'
+DATABASE_ROUTERS = ['core.db.ReadReplicaRouter']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        # По умолчанию 300: страницы и фрагменты вытесняли бы версии лент
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+# Пользователь сессии берётся из кеша, а не из базы на каждый запрос
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = 60 * 60
+# Срок для кеша в памяти процесса, где чужие удаления записи не видны
+USER_LOCAL_CACHE_TIMEOUT = 5
+# Сессия читается из кеша, а пишется и в кеш, и в базу
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:main_page'
+# LOGOUT_REDIRECT_URL = 'users:logout'
+
+STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+# Куда collectstatic собирает статику
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+# Отдавать статику из STATIC_ROOT через core.views.serve_static
+SERVE_STATIC = False
+# Для файлов с хешем содержимого в имени: они никогда не меняются
+STATIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+#  подключаем движок filebased.EmailBackend
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# указываем директорию, в которую будут складываться файлы писем
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
@@ -0,0 +1,137 @@
+"""Настройки продакшена.
+
+Секреты, база и кеш задаются переменными окружения. Обязательны
+DJANGO_SECRET_KEY, DJANGO_ALLOWED_HOSTS и, для CACHE_BACKEND redis
+(по умолчанию) или memcached, CACHE_LOCATION; кроме них читаются
+DB_*, STATIC_ROOT, SERVE_STATIC.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, STATIC_ROOT, TEMPLATES
+
+
+def required_env(name):
+    value = os.environ.get(name)
+    if not value:
+        raise ImproperlyConfigured(f'Задайте переменную окружения {name}')
+    return value
+
+
+DEBUG = False
+
+SECRET_KEY = required_env('DJANGO_SECRET_KEY')
+
+ALLOWED_HOSTS = required_env('DJANGO_ALLOWED_HOSTS').split(',')
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'django.db.backends.sqlite3')
+
+DATABASES = {
+    'default': {
+        'ENGINE': DB_ENGINE,
+        'NAME': os.environ.get('DB_NAME', DATABASES['default']['NAME']),
+        'USER': os.environ.get('DB_USER', ''),
+        'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+        'HOST': os.environ.get('DB_HOST', ''),
+        'PORT': os.environ.get('DB_PORT', ''),
+        # Соединение живёт между запросами, а не открывается на каждый
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        # Ожидание блокировки записи, секунды
+        'OPTIONS': {'timeout': 20} if DB_ENGINE.endswith('sqlite3') else {},
+    }
+}
+# Ленты читают через отдельные соединения только для чтения: в SQLite
+# это тот же файл, в другой СУБД - реплика по DB_REPLICA_HOST
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'HOST': os.environ.get('DB_REPLICA_HOST', DATABASES['default']['HOST']),
+    'READ_ONLY': True,
+    'TEST': {'MIRROR': 'default'},
+}
+
+
+def cache_config(backend, location):
+    """Кеш, общий для всех процессов.
+
+    Версии и фрагменты лент, кеши групп, пользователей и страниц и их
+    сброс из воркеров run_workers должны быть видны всем процессам,
+    поэтому кеш в памяти процесса здесь не подходит. redis (django-redis)
+    и memcached (python-memcached) общие для всех серверов; file -
+    замена без сервера кеша, общая для процессов одной машины.
+    """
+    if backend == 'file':
+        return {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location or os.path.join(BASE_DIR, 'cache'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    if backend not in ('redis', 'memcached'):
+        raise ImproperlyConfigured(
+            'CACHE_BACKEND должен быть redis, memcached или file, '
+            f'а не {backend}'
+        )
+    if not location:
+        raise ImproperlyConfigured(
+            f'Задайте CACHE_LOCATION - адрес сервера {backend}'
+        )
+    if backend == 'redis':
+        return {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': location,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': location.split(','),
+    }
+
+
+CACHES = {
+    'default': cache_config(
+        os.environ.get('CACHE_BACKEND', 'redis'),
+        os.environ.get('CACHE_LOCATION', ''),
+    ),
+}
+
+# Сессии пишутся в базу, а читаются через кеш: перезапуск или очистка
+# кеша не разлогинивает пользователей
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Счётчики постов в базе вместо COUNT(*) на каждой странице ленты
+POSTS_COUNT_STRATEGY = 'counter'
+
+# Побочные эффекты записи выполняют воркеры manage.py run_workers
+JOBS_EAGER = False
+
+# Анонимные посетители получают страницы из кеша
+PAGE_CACHE_TIMEOUT = 60
+
+# Метрики собираются для каждого сотого запроса
+REQUEST_METRICS_SAMPLE_RATE = 0.01
+
+# Шаблоны читаются и разбираются один раз на процесс
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+# Компилировать все шаблоны при старте WSGI-процесса
+WARM_TEMPLATES = True
+
+# Статика с хешем в имени и сжатыми копиями: manage.py collectstatic
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+STATIC_ROOT = os.environ.get('STATIC_ROOT', STATIC_ROOT)
+# Без веб-сервера перед Django статику отдаёт само приложение
+SERVE_STATIC = os.environ.get('SERVE_STATIC', '1') == '1'
@@ -0,0 +1,9 @@
+"""Настройки для прогона тестов."""
+from .base import *  # noqa: F401,F403
+
+DEBUG = False
+
+# Стойкий хеш паролей в тестах только замедляет create_user
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
@@ -1,10 +1,23 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from core.views import request_metrics, serve_static
 
 urlpatterns = [
     path('', include('posts.urls', namespace='posts')),
+    # Раньше admin/, иначе адрес перехватит админка
+    path('admin/metrics/', request_metrics, name='request_metrics'),
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
 ]
+
+if settings.SERVE_STATIC:
+    urlpatterns += [
+        re_path(
+            r'^{}(?P<path>.*)$'.format(settings.STATIC_URL.lstrip('/')),
+            serve_static,
+        ),
+    ]